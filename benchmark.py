@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks del verificador.
+
+    python benchmark.py arranque [--repeticiones N] [--max-ms MS]
+    python benchmark.py suite [--escenarios pequeno,mediano,grande] [--latencia ninguna]
+                              [--hosts N] [--configuraciones K] [--repeticiones N]
+                              [--guardar RUTA] [--linea-base RUTA] [--tolerancia 0.25]
+
+'arranque' mide el arranque en frío de una ejecución de un solo control
+reproduciendo salidas capturadas y termina con código 1 si la mediana supera
+el umbral.
+
+'suite' genera hosts sintéticos que cubren todos los comandos de los
+verificadores y recorre el flujo completo (recolección reproducida, análisis,
+evaluación, calcular_puntuaciones y reportes) para un host y para una flota.
+El resultado es JSON estable (claves ordenadas, semilla fija); con
+--linea-base termina con código 1 si el rendimiento, el p95 o la memoria
+pico empeoran más que la tolerancia.
+"""
+
+import sys
+import os
+import json
+import math
+import time
+import random
+import tempfile
+import subprocess
+import statistics
+import tracemalloc
+from datetime import datetime, timedelta
+
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+VERI = os.path.join(RAIZ, "veri.py")
+sys.path.insert(0, RAIZ)
+
+import veri
+
+
+# Salidas mínimas para ejecutar solo el verificador de firewall
+SALIDAS_FIREWALL = {
+    "netsh advfirewall show allprofiles": "Domain Profile Settings:\nState                                 ON\n"
+}
+
+ESCENARIOS = {
+    "pequeno": {"cuentas": 5, "reglas": 20, "discos": 1},
+    "mediano": {"cuentas": 200, "reglas": 500, "discos": 4},
+    "grande": {"cuentas": 2000, "reglas": 5000, "discos": 26},
+}
+
+# Latencia simulada por comando en segundos: (ligero, pesado WMI/PowerShell).
+# Con latencia, la recolección pasa por veri.NucleoRecoleccion.
+PERFILES_LATENCIA = {
+    "ninguna": (0.0, 0.0),
+    "rapida": (0.002, 0.02),
+    "lenta": (0.01, 0.25),
+}
+
+SEMILLA = 27001
+# Las fechas sintéticas cuelgan de esta fecha y los verificadores la usan como
+# "ahora", así que las antigüedades no cambian de un día para otro
+FECHA_REFERENCIA = datetime(2026, 1, 15, 9, 0, 0)
+
+
+# ============================================================================
+# GENERADOR DE HOSTS SINTÉTICOS
+# ============================================================================
+
+def _sid_maquina(rng):
+    return "S-1-5-21-{}-{}-{}".format(*(rng.randint(10 ** 8, 4 * 10 ** 9) for _ in range(3)))
+
+
+def _fecha(rng, max_dias):
+    dias = rng.randint(0, max_dias)
+    return (FECHA_REFERENCIA - timedelta(days=dias, seconds=rng.randint(0, 86399))).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _net_accounts(rng):
+    return "\r\n".join([
+        "Force user logoff how long after time expires?:       Never",
+        f"Minimum password length:                              {rng.choice([0, 8, 12, 14])}",
+        f"Maximum password age (days):                          {rng.choice([42, 90, 365])}",
+        f"Password history length:                              {rng.choice([0, 5, 24])}",
+        f"Lockout threshold:                                    {rng.choice([0, 5, 10])}",
+        f"Lockout duration (minutes):                           {rng.choice([10, 30])}",
+        "Lockout observation window (minutes):                 30",
+        "Computer role:                                        WORKSTATION",
+        "Password complexity is required" if rng.random() < 0.5 else "",
+        "The command completed successfully.",
+        ""
+    ])
+
+
+def _firewall(rng, reglas):
+    lineas = []
+    for perfil in ("Domain", "Private", "Public"):
+        lineas += [
+            f"{perfil} Profile Settings:",
+            "-" * 64,
+            f"State                                 {'ON' if rng.random() < 0.8 else 'OFF'}",
+            "Firewall Policy                       BlockInbound,AllowOutbound",
+            "InboundUserNotification               Enable",
+            ""
+        ]
+    # Relleno con reglas para escalar el tamaño de la salida a analizar
+    for i in range(reglas):
+        lineas += [
+            f"Rule Name:                            Regla sintética {i}",
+            f"Enabled:                              {'Yes' if i % 3 else 'No'}",
+            f"Direction:                            {'In' if i % 2 else 'Out'}",
+            f"LocalPort:                            {1024 + i % 50000}",
+            "Action:                               Allow",
+            ""
+        ]
+    return "\r\n".join(lineas + ["Ok.", ""])
+
+
+def _wevtutil(rng):
+    # Solo se analiza maxSize: la salida no crece con el tamaño real del registro
+    return "\r\n".join([
+        "name: Security",
+        "enabled: true",
+        "type: Admin",
+        "owningPublisher:",
+        "isolation: Custom",
+        "logging:",
+        r"  logFileName: %SystemRoot%\System32\Winevt\Logs\Security.evtx",
+        "  retention: false",
+        "  autoBackup: false",
+        f"  maxSize: {rng.choice([20, 128, 512, 1024, 4096]) * 1024 * 1024}",
+        ""
+    ])
+
+
+def _cuentas(rng, sid, n):
+    usuarios = [
+        {"Nombre": "Administrator", "SID": f"{sid}-500", "Habilitada": rng.random() < 0.3,
+         "Descripcion": "Built-in account for administering the computer/domain",
+         "UltimoLogon": _fecha(rng, 400), "UltimaClave": _fecha(rng, 400)},
+        {"Nombre": "Guest", "SID": f"{sid}-501", "Habilitada": rng.random() < 0.1,
+         "Descripcion": "Built-in account for guest access", "UltimoLogon": None, "UltimaClave": None},
+    ]
+    for i in range(n):
+        servicio = rng.random() < 0.1
+        usuarios.append({
+            "Nombre": f"svc_app{i}" if servicio else f"usuario{i:05d}",
+            "SID": f"{sid}-{1001 + i}",
+            "Habilitada": rng.random() < 0.85,
+            "Descripcion": "Cuenta de servicio" if servicio else "Puesto de laboratorio",
+            "UltimoLogon": _fecha(rng, 180) if rng.random() < 0.9 else None,
+            "UltimaClave": _fecha(rng, 200),
+        })
+    administradores = [u["SID"] for u in usuarios[:2 + max(1, n // 50)]]
+    grupos = [
+        {"Nombre": "Administrators", "SID": "S-1-5-32-544", "Miembros": administradores},
+        {"Nombre": "Users", "SID": "S-1-5-32-545", "Miembros": [u["SID"] for u in usuarios[2:]]},
+        {"Nombre": "Guests", "SID": "S-1-5-32-546", "Miembros": [f"{sid}-501"]},
+    ]
+    return json.dumps({"Usuarios": usuarios, "Grupos": grupos, "EnableLUA": 1 if rng.random() < 0.9 else 0})
+
+
+def _discos(rng, n):
+    letras = "CDEFGHIJKLMNOPQRSTUVWXYZAB"
+    lineas = ["FileSystem  Name  "]
+    for i in range(n):
+        fs = "NTFS" if i == 0 or rng.random() < 0.85 else rng.choice(["FAT32", "exFAT", "ReFS"])
+        lineas.append(f"{fs:<12}{letras[i % 26]}:    ")
+    return "\r\n".join(lineas + ["", ""])
+
+
+def generar_host(rng, host, cuentas=5, reglas=20, discos=1, sid=None):
+    """Salidas en bruto {comando: salida} para todos los comandos de VERIFICADORES."""
+    sid = sid or _sid_maquina(rng)
+    salidas = {
+        veri.VerificadorContraseñas.CMD_CUENTAS: _net_accounts(rng),
+        veri.VerificadorActualizaciones.CMD_SERVICIO_WU: rng.choice(["Running", "Stopped"]) + "\r\n",
+        veri.VerificadorActualizaciones.CMD_HOTFIX:
+            (FECHA_REFERENCIA - timedelta(days=rng.randint(1, 120))).strftime("%m/%d/%Y 00:00:00") + "\r\n",
+        veri.VerificadorFirewall.CMD_PERFILES: _firewall(rng, reglas),
+        veri.VerificadorAntimalware.CMD_DEFENDER: rng.choice(["True", "False"]) + "\r\n",
+        veri.VerificadorAntimalware.CMD_TIEMPO_REAL: rng.choice(["True", "False"]) + "\r\n",
+        veri.VerificadorAuditoria.CMD_LOG_SEGURIDAD: _wevtutil(rng),
+        veri.VerificadorUsuarios.CMD_CUENTAS: _cuentas(rng, sid, cuentas),
+        veri.VerificadorEncriptacion.CMD_DISCOS: _discos(rng, discos),
+    }
+    comandos = {c for clase in veri.VERIFICADORES.values() for c in clase.comandos}
+    faltan = comandos - set(salidas)
+    if faltan:
+        raise RuntimeError(f"El generador no cubre: {sorted(faltan)}")
+    # El nombre del host aparece en las salidas igual que en los equipos reales
+    salidas[veri.VerificadorFirewall.CMD_PERFILES] = f"Host: {host}\r\n" + salidas[veri.VerificadorFirewall.CMD_PERFILES]
+    return salidas
+
+
+def generar_flota(hosts, configuraciones, escenario, semilla=SEMILLA):
+    """hosts equipos clonados de 'configuraciones' imágenes base; solo cambian nombre y SID de máquina."""
+    imagenes = []
+    for i in range(configuraciones):
+        rng = random.Random(semilla + i)
+        sid = _sid_maquina(rng)
+        imagenes.append((sid, generar_host(rng, f"IMAGEN{i:03d}", sid=sid, **escenario)))
+
+    flota = {}
+    rng = random.Random(semilla)
+    for i in range(hosts):
+        sid_imagen, salidas = imagenes[i % configuraciones]
+        host = f"PC{i:05d}"
+        sid = _sid_maquina(rng)
+        flota[host] = {
+            cmd: salida.replace(sid_imagen, sid).replace(f"IMAGEN{i % configuraciones:03d}", host)
+            for cmd, salida in salidas.items()
+        }
+    return flota
+
+
+# ============================================================================
+# MEDICIÓN
+# ============================================================================
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[max(0, math.ceil(p * len(ordenados)) - 1)]
+
+
+# Proceso suplente de cada comando real: espera la latencia y vuelca la salida.
+# En POSIX basta un sh (~1 ms por proceso); el intérprete de Python (~20 ms)
+# solo se usa donde no hay sh y su arranque se descuenta con la línea base.
+SUPLENTE_SH = 'sleep "$1"; exec cat "$2"'
+SUPLENTE = ("import shutil, sys, time; time.sleep(float(sys.argv[1])); "
+            "shutil.copyfileobj(open(sys.argv[2], 'rb'), sys.stdout.buffer)")
+
+
+def _suplente(espera, ruta):
+    import shutil
+    sh = shutil.which("sh") if os.name == "posix" else None
+    if sh:
+        return [sh, "-c", SUPLENTE_SH, "sh", str(espera), ruta]
+    return [sys.executable, "-S", "-I", "-c", SUPLENTE, str(espera), ruta]
+
+
+def recolectar(salidas, perfil, directorio, esperar=True):
+    """
+    Reproduce la recolección. Sin latencia copia las salidas en memoria; con
+    latencia lanza un proceso suplente por comando a través del núcleo
+    asíncrono de veri, con la clase (ligero/pesado) del comando real.
+    Con esperar=False los suplentes no esperan: sirve de línea base del coste
+    de lanzar los procesos.
+    """
+    ligero, pesado = PERFILES_LATENCIA[perfil]
+    if not ligero and not pesado:
+        return dict(salidas)
+
+    import locale
+    codificacion = locale.getpreferredencoding(False)
+    comandos = {}
+    for i, (cmd, salida) in enumerate(salidas.items()):
+        ruta = os.path.join(directorio, f"salida{i}.txt")
+        with open(ruta, "w", encoding=codificacion, errors="replace", newline="") as f:
+            f.write(salida)
+        clase = veri.comando_de(cmd).clase
+        espera = (pesado if clase == "pesado" else ligero) if esperar else 0
+        comandos[cmd] = veri.Comando(_suplente(espera, ruta), clase, 60)
+    return veri.recolectar(comandos)
+
+
+def _linea_base_suplentes(salidas, perfil, directorio, repeticiones=3):
+    """Mediana en segundos de una recolección con suplentes que no esperan."""
+    ligero, pesado = PERFILES_LATENCIA[perfil]
+    if not ligero and not pesado:
+        return 0.0
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        recolectar(salidas, perfil, directorio, esperar=False)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def _flujo_host(salidas, perfil, directorio, base=0.0):
+    etapas = {}
+    t0 = time.perf_counter()
+    recogidas = recolectar(salidas, perfil, directorio)
+    t1 = time.perf_counter()
+    reportes = veri.GeneradorReportes(directorio)
+    for nombre, clase in veri.VERIFICADORES.items():
+        reportes.agregar_verificacion(nombre, clase(salidas=recogidas, ahora=FECHA_REFERENCIA).verificar())
+    t2 = time.perf_counter()
+    reportes.calcular_puntuaciones()
+    t3 = time.perf_counter()
+    reportes.emitir(list(veri.EMISORES), recogidas, host="BENCH")
+    t4 = time.perf_counter()
+    # Solo el efecto de la latencia simulada: sin el arranque de los suplentes
+    etapas["recoleccion"] = max(0.0, t1 - t0 - base)
+    etapas["evaluacion"] = t2 - t1
+    etapas["puntuaciones"] = t3 - t2
+    etapas["reportes"] = t4 - t3
+    return etapas
+
+
+def _memoria_pico(funcion):
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+
+
+def _resumen_tiempos(latencias):
+    return {
+        "p50_ms": round(_percentil(latencias, 0.50) * 1000, 3),
+        "p95_ms": round(_percentil(latencias, 0.95) * 1000, 3),
+    }
+
+
+def medir_host(escenario, perfil, repeticiones):
+    salidas = generar_host(random.Random(SEMILLA), "BENCH", **ESCENARIOS[escenario])
+    with tempfile.TemporaryDirectory() as tmp:
+        _flujo_host(salidas, perfil, tmp)  # calentamiento
+        base = _linea_base_suplentes(salidas, perfil, tmp)
+        mediciones = [_flujo_host(salidas, perfil, tmp, base) for _ in range(repeticiones)]
+        memoria = _memoria_pico(lambda: _flujo_host(salidas, perfil, tmp, base))
+
+    totales = [sum(m.values()) for m in mediciones]
+    resultado = {
+        "hosts_por_segundo": round(len(totales) / sum(totales), 3),
+        "memoria_pico_kb": memoria,
+        "bytes_entrada": sum(len(s) for s in salidas.values()),
+        "suplentes_base_ms": round(base * 1000, 3),
+        "etapas_ms": {
+            etapa: round(statistics.mean(m[etapa] for m in mediciones) * 1000, 3)
+            for etapa in mediciones[0]
+        }
+    }
+    resultado.update(_resumen_tiempos(totales))
+    return resultado
+
+
+def _flujo_flota(flota, directorio):
+    evaluador = veri.EvaluadorFlota(ahora=FECHA_REFERENCIA)
+    latencias = []
+    for host, salidas in flota.items():
+        inicio = time.perf_counter()
+        evaluador.evaluar_host(host, salidas)
+        latencias.append(time.perf_counter() - inicio)
+    resumen = evaluador.resumen()
+
+    inicio = time.perf_counter()
+    ruta = os.path.join(directorio, "flota.veri")
+    veri.escribir_binario(ruta, {
+        host: {"reporte": r.construir_modelo(host=host).contenido(), "salidas": flota[host]}
+        for host, r in evaluador.reportes.items()
+    })
+    escritura = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    with veri.LectorBinario(ruta) as lector:
+        ultimo = lector.hosts()[-1]
+        lector.control(ultimo, "Firewall", "Firewall habilitado (Dominio)")
+    lectura = time.perf_counter() - inicio
+    return latencias, escritura, lectura, resumen
+
+
+def medir_flota(escenario, hosts, configuraciones, repeticiones):
+    flota = generar_flota(hosts, configuraciones, ESCENARIOS[escenario])
+    with tempfile.TemporaryDirectory() as tmp:
+        corridas = [_flujo_flota(flota, tmp) for _ in range(repeticiones)]
+        memoria = _memoria_pico(lambda: _flujo_flota(flota, tmp))
+
+    latencias = [l for c in corridas for l in c[0]]
+    evaluacion = [sum(c[0]) for c in corridas]
+    resumen = corridas[-1][3]
+    resultado = {
+        "hosts": hosts,
+        "configuraciones": configuraciones,
+        "hosts_por_segundo": round(hosts * len(evaluacion) / sum(evaluacion), 3),
+        "evaluaciones": resumen["evaluaciones"],
+        "tasa_aciertos": resumen["tasa_aciertos"],
+        "memoria_pico_kb": memoria,
+        "escritura_binario_ms": round(statistics.mean(c[1] for c in corridas) * 1000, 3),
+        "lectura_control_ms": round(statistics.mean(c[2] for c in corridas) * 1000, 3),
+    }
+    resultado.update(_resumen_tiempos(latencias))
+    return resultado
+
+
+def _medir_importacion():
+    """Tiempo acumulado de 'import veri' según -X importtime (ms)."""
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import veri"],
+        cwd=RAIZ, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True, check=True
+    ).stderr
+    for linea in salida.splitlines():
+        partes = [p.strip() for p in linea.split("|")]
+        if len(partes) == 3 and partes[2] == "veri":
+            return int(partes[1]) / 1000
+    return None
+
+
+def medir_arranque(repeticiones=10):
+    with tempfile.TemporaryDirectory() as tmp:
+        entrada = os.path.join(tmp, "salidas.json")
+        with open(entrada, "w", encoding="utf-8") as f:
+            json.dump(SALIDAS_FIREWALL, f)
+
+        cmd = [sys.executable, VERI, "--only", "firewall", "--entrada", entrada, "--stdout"]
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            subprocess.run(cmd, cwd=tmp, stdout=subprocess.DEVNULL, check=True)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        interprete_ms = (time.perf_counter() - inicio) * 1000
+
+    return {
+        "repeticiones": repeticiones,
+        "importacion_ms": _medir_importacion(),
+        "interprete_ms": round(interprete_ms, 2),
+        "ejecucion_mediana_ms": round(statistics.median(tiempos), 2),
+        "ejecucion_p95_ms": round(_percentil(tiempos, 0.95), 2),
+        "ejecucion_min_ms": round(min(tiempos), 2)
+    }
+
+
+# ============================================================================
+# COMPARACIÓN CON LÍNEA BASE
+# ============================================================================
+
+# métrica -> True si un valor mayor es mejor
+METRICAS_REGRESION = {
+    "hosts_por_segundo": True,
+    "p95_ms": False,
+    "mediana_ms": False,
+    "memoria_pico_kb": False,
+}
+
+
+def comparar(actual, base, tolerancia):
+    regresiones = []
+    for carga, metricas in base.get("cargas", {}).items():
+        if carga not in actual["cargas"]:
+            continue
+        for metrica, mayor_mejor in METRICAS_REGRESION.items():
+            if metrica not in metricas or metrica not in actual["cargas"][carga]:
+                continue
+            antes = metricas[metrica]
+            ahora = actual["cargas"][carga][metrica]
+            if mayor_mejor:
+                empeora = ahora < antes * (1 - tolerancia)
+            else:
+                empeora = ahora > antes * (1 + tolerancia)
+            if empeora:
+                regresiones.append({"carga": carga, "metrica": metrica, "base": antes, "actual": ahora})
+    return regresiones
+
+
+def ejecutar_suite(escenarios, perfil, hosts, configuraciones, repeticiones, arranque=True):
+    cargas = {}
+    for escenario in escenarios:
+        cargas[f"host/{escenario}/{perfil}"] = medir_host(escenario, perfil, repeticiones)
+        cargas[f"flota/{escenario}"] = medir_flota(escenario, hosts, configuraciones, max(1, repeticiones // 2))
+    if arranque:
+        a = medir_arranque()
+        cargas["arranque"] = {
+            "mediana_ms": a["ejecucion_mediana_ms"],
+            "p95_ms": a["ejecucion_p95_ms"],
+            "importacion_ms": a["importacion_ms"],
+        }
+
+    import platform
+    return {
+        "version": veri.VERSION,
+        "entorno": {
+            "python": platform.python_version(),
+            "plataforma": sys.platform,
+            "maquina": platform.machine(),
+        },
+        "parametros": {
+            "escenarios": list(escenarios),
+            "latencia": perfil,
+            "hosts": hosts,
+            "configuraciones": configuraciones,
+            "repeticiones": repeticiones,
+            "semilla": SEMILLA,
+        },
+        "cargas": cargas,
+    }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmarks del verificador de seguridad")
+    sub = parser.add_subparsers(dest="comando")
+
+    p_arranque = sub.add_parser("arranque", help="arranque en frío de una ejecución de un solo control")
+    p_arranque.add_argument("--repeticiones", type=int, default=10)
+    p_arranque.add_argument("--max-ms", type=float, default=150.0,
+                            help="umbral para la mediana de la ejecución completa")
+
+    p_suite = sub.add_parser("suite", help="flujo completo con hosts sintéticos, individual y en flota")
+    p_suite.add_argument("--escenarios", default="pequeno,mediano,grande",
+                         help=f"lista separada por comas: {', '.join(ESCENARIOS)}")
+    p_suite.add_argument("--latencia", default="ninguna", choices=sorted(PERFILES_LATENCIA))
+    p_suite.add_argument("--hosts", type=int, default=200)
+    p_suite.add_argument("--configuraciones", type=int, default=20)
+    p_suite.add_argument("--repeticiones", type=int, default=5)
+    p_suite.add_argument("--sin-arranque", action="store_true", help="omitir la medición de arranque")
+    p_suite.add_argument("--guardar", metavar="RUTA", help="escribir los resultados en RUTA")
+    p_suite.add_argument("--linea-base", metavar="RUTA", help="resultados previos con los que comparar")
+    p_suite.add_argument("--tolerancia", type=float, default=0.25,
+                         help="empeoramiento relativo admitido antes de fallar (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    if args.comando == "arranque":
+        resultado = medir_arranque(args.repeticiones)
+        resultado["max_ms"] = args.max_ms
+        resultado["ok"] = resultado["ejecucion_mediana_ms"] <= args.max_ms
+        print(json.dumps(resultado, indent=2, sort_keys=True))
+        return 0 if resultado["ok"] else 1
+
+    if args.comando == "suite":
+        escenarios = [e.strip() for e in args.escenarios.split(",") if e.strip()]
+        desconocidos = [e for e in escenarios if e not in ESCENARIOS]
+        if desconocidos:
+            parser.error(f"Escenario desconocido: {', '.join(desconocidos)}")
+        resultado = ejecutar_suite(escenarios, args.latencia, args.hosts, args.configuraciones,
+                                   args.repeticiones, arranque=not args.sin_arranque)
+        if args.linea_base:
+            with open(args.linea_base, encoding="utf-8") as f:
+                base = json.load(f)
+            resultado["regresiones"] = comparar(resultado, base, args.tolerancia)
+        texto = json.dumps(resultado, indent=2, sort_keys=True)
+        if args.guardar:
+            with open(args.guardar, "w", encoding="utf-8") as f:
+                f.write(texto + "\n")
+        print(texto)
+        return 1 if resultado.get("regresiones") else 0
+
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
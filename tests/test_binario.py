@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del contenedor binario .veri (EscritorBinario / LectorBinario).
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import veri
+
+
+def _reporte(host, n=3):
+    return {
+        "fecha": "2026-01-15T09:00:00",
+        "puntuacion_general": 50,
+        "controles_cumplidos": "1/2",
+        "puntuaciones_iso": {"ISO/IEC 27001 A.13": {"cumplidos": 1, "total": 2, "porcentaje": 50}},
+        "total_hallazgos": 1,
+        "verificaciones": {
+            f"Verificador {i}": {
+                "componente": f"Verificador {i}",
+                "estado": "NO_CUMPLE",
+                "hallazgos": [{"titulo": f"Hallazgo de {host}", "control": "Control A", "descripcion": "x",
+                               "severidad": "ALTO", "norma_iso": "A.13.1.1", "recomendacion": "y"}],
+                "norma_referencia": "ISO/IEC 27001 A.13.1",
+                "controles": [{"nombre": "Control A", "cumple": False, "valor": "No"},
+                              {"nombre": "Control B", "cumple": True, "valor": "Sí"}],
+            }
+            for i in range(n)
+        },
+        "hallazgos": [],
+    }
+
+
+def _con_hallazgos(reporte):
+    reporte["hallazgos"] = [h for v in reporte["verificaciones"].values() for h in v["hallazgos"]]
+    reporte["total_hallazgos"] = len(reporte["hallazgos"])
+    return reporte
+
+
+class TestContenedor(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "prueba.veri")
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def test_ida_y_vuelta_con_json(self):
+        reporte = _con_hallazgos(_reporte("PC01"))
+        ruta_json = os.path.join(self.directorio.name, "reporte.json")
+        with open(ruta_json, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False)
+
+        veri.json_a_binario(ruta_json, self.ruta, host="PC01")
+        vuelta = veri.binario_a_json(self.ruta, os.path.join(self.directorio.name, "vuelta.json"))
+
+        self.assertEqual(vuelta, reporte)
+        self.assertEqual(list(vuelta), list(reporte))
+
+    def test_contenedor_sin_hosts(self):
+        veri.escribir_binario(self.ruta, {})
+        with veri.LectorBinario(self.ruta) as lector:
+            self.assertEqual(lector.hosts(), [])
+            self.assertEqual(lector.salidas("PC01"), {})
+        with self.assertRaises(ValueError):
+            veri.binario_a_json(self.ruta)
+
+    def test_tipos(self):
+        valor = {
+            "enteros": [0, 1, -1, 127, 128, -129, 2 ** 40, -(2 ** 63)],
+            "reales": [0.0, -1.5, 3.141592653589793, 1e300],
+            "logicos": [True, False, None],
+            "anidadas": [[], [[1, [2, [3, "cuatro"]]]], {"clave": [{"a": -7}]}],
+            "cadenas": ["", "ñandú ✓", "x" * 64, "é" * 33],
+            7: "clave numérica",
+        }
+        with veri.EscritorBinario(self.ruta) as escritor:
+            escritor.agregar(("host", "PC01", "datos"), valor)
+        with veri.LectorBinario(self.ruta) as lector:
+            leido = lector.leer(("host", "PC01", "datos"))
+        esperado = dict(valor)
+        esperado["7"] = esperado.pop(7)
+        self.assertEqual(leido, esperado)
+
+    def test_cadenas_largas(self):
+        larga = "".join(f"línea {i}: Rule Name: Regla sintética\r\n" for i in range(50))
+        enorme = "ñ" * (veri.TAMANO_BLOQUE + 1000)
+        salidas = {"netsh": larga, "wevtutil": enorme, "corta": "ON", "repetida": larga}
+        self.assertGreater(len(larga.encode("utf-8")), veri.LIMITE_CADENA_CORTA)
+
+        veri.escribir_binario(self.ruta, {
+            f"PC{i:02d}": {"reporte": _reporte(f"PC{i:02d}"), "salidas": dict(salidas, host=f"PC{i:02d}" * 40)}
+            for i in range(5)
+        })
+        with veri.LectorBinario(self.ruta) as lector:
+            for i in range(5):
+                self.assertEqual(lector.salidas(f"PC{i:02d}"), dict(salidas, host=f"PC{i:02d}" * 40))
+        # Las cadenas largas se internan una vez y van comprimidas
+        self.assertLess(os.path.getsize(self.ruta), len(enorme.encode("utf-8")) // 10)
+
+    def test_host_inexistente(self):
+        veri.escribir_binario(self.ruta, {"PC01": {"reporte": _reporte("PC01")}})
+        with veri.LectorBinario(self.ruta) as lector:
+            self.assertEqual(lector.verificaciones("PC99"), [])
+            self.assertEqual(lector.salidas("PC99"), {})
+            with self.assertRaises(KeyError):
+                lector.verificacion("PC99", "Verificador 0")
+            with self.assertRaises(KeyError):
+                lector.reporte("PC99")
+
+    def test_leer_un_host_sin_decodificar_los_demas(self):
+        hosts = {f"PC{i:03d}": {"reporte": _reporte(f"PC{i:03d}"), "salidas": {"cmd": f"salida {i}" * 20}}
+                 for i in range(200)}
+        veri.escribir_binario(self.ruta, hosts)
+
+        with veri.LectorBinario(self.ruta) as lector:
+            with mock.patch.object(lector, "_leer_registro", wraps=lector._leer_registro) as registros:
+                control = lector.control("PC150", "Verificador 1", "Control B")
+                salidas = lector.salidas("PC150")
+            self.assertEqual(control, {"nombre": "Control B", "cumple": True, "valor": "Sí"})
+            self.assertEqual(salidas, {"cmd": "salida 150" * 20})
+            # Índice del host, su verificación y sus salidas; nada de los otros 199
+            self.assertEqual(registros.call_count, 3)
+            self.assertEqual(list(lector._indices), [("host", "PC150")])
+            self.assertEqual(lector.hosts(), list(hosts))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la línea de comandos: selección de controles y reproducción de
+salidas capturadas.
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import veri
+
+
+class TestSeleccion(unittest.TestCase):
+    def test_selector_de_control(self):
+        seleccion = veri.seleccionar_verificadores(["usuarios:uac"], ["firewall"])
+        self.assertEqual(seleccion["Usuarios y Cuentas"], (["uac"], []))
+        self.assertNotIn("Firewall", seleccion)
+
+    def test_selector_sin_coincidencias_falla_antes_de_recolectar(self):
+        for only, skip in ((["firewall:nada"], None), (None, ["usuarios:xyz"])):
+            with self.assertRaisesRegex(ValueError, "Ningún control"):
+                veri.seleccionar_verificadores(only, skip)
+
+        with mock.patch.object(veri, "recolectar") as recolectar, \
+                mock.patch("sys.stderr"), self.assertRaises(SystemExit):
+            veri.main(["--only", "firewall:nada", "--sin-ui", "--formato", "ninguno"])
+        recolectar.assert_not_called()
+
+    def test_estado_de_los_controles_filtrados(self):
+        resultado = veri.filtrar_controles({
+            "estado": "CUMPLE", "hallazgos": [],
+            "controles": [{"nombre": "Servicio WuAuServ en ejecución", "cumple": False, "valor": "No"},
+                          {"nombre": "Windows Update automático", "cumple": True, "valor": "Sí"}],
+        }, ["wuauserv"], [])
+        self.assertEqual(resultado["estado"], "NO_CUMPLE")
+
+
+class TestReproduccion(unittest.TestCase):
+    def test_antiguedades_respecto_a_la_fecha_de_captura(self):
+        fecha = "2026-01-15T09:00:00"
+        salidas = {veri.VerificadorActualizaciones.CMD_HOTFIX: "01/10/2026 00:00:00\r\n"}
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = os.path.join(tmp, "captura.veri")
+            veri.escribir_binario(ruta, {"PC01": {"reporte": {"fecha": fecha}, "salidas": salidas}})
+            self.assertEqual(veri.cargar_salidas(ruta), (salidas, veri.datetime(2026, 1, 15, 9, 0, 0)))
+
+            with mock.patch("sys.stdout", new_callable=mock.MagicMock) as stdout:
+                codigo = veri.main(["--entrada", ruta, "--only", "actualizaciones:última", "--stdout"])
+            self.assertEqual(codigo, 0)
+            escrito = b"".join(c.args[0] for c in stdout.buffer.write.call_args_list)
+        control = json.loads(escrito)["verificaciones"]["Actualizaciones y Parches"]["controles"][0]
+        self.assertEqual(control["valor"], "5 días")
+
+
+if __name__ == "__main__":
+    unittest.main()
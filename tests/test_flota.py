@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de EvaluadorFlota: deduplicación por huella y aislamiento entre
+hosts de los resultados memorizados.
+"""
+
+import os
+import sys
+import json
+import unittest
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import veri
+
+
+AHORA = datetime(2026, 1, 15, 9, 0, 0)
+
+
+def _cuentas(host, sid, imagen=0, admin=None, ultimo_logon="2026-01-10T08:00:00"):
+    usuarios = [
+        {"Nombre": admin or "Administrator", "SID": f"{sid}-500", "Habilitada": True,
+         "UltimoLogon": ultimo_logon, "UltimaClave": "2026-01-01T08:00:00"},
+        {"Nombre": "Guest", "SID": f"{sid}-501", "Habilitada": False, "UltimoLogon": None, "UltimaClave": None},
+    ] + [
+        {"Nombre": f"usuario{i}", "SID": f"{sid}-{1001 + i}", "Habilitada": True,
+         "UltimoLogon": "2026-01-12T08:00:00", "UltimaClave": "2026-01-02T08:00:00"}
+        for i in range(imagen)
+    ]
+    grupos = [{"Nombre": "Administrators", "SID": veri.SID_ADMINISTRADORES, "Miembros": [f"{sid}-500"]}]
+    return json.dumps({"Usuarios": usuarios, "Grupos": grupos, "EnableLUA": 1})
+
+
+def _salidas(host, sid, imagen=0, **cuentas):
+    """Salidas de un host clonado de la imagen 'imagen': solo cambian nombre y SID."""
+    salidas = {cmd: "" for clase in veri.VERIFICADORES.values() for cmd in clase.comandos}
+    salidas.update({
+        veri.VerificadorFirewall.CMD_PERFILES:
+            f"Host: {host}\r\nDomain Profile Settings:\r\nState                                 "
+            f"{'ON' if imagen % 2 else 'OFF'}\r\nRule Name: Regla de la imagen {imagen}\r\n",
+        veri.VerificadorAuditoria.CMD_LOG_SEGURIDAD: f"  maxSize: {(imagen + 1) * 128 * 1024 * 1024}\r\n",
+        veri.VerificadorUsuarios.CMD_CUENTAS: _cuentas(host, sid, imagen, **cuentas),
+    })
+    return salidas
+
+
+def _control(reporte, componente, nombre):
+    return next(c for c in reporte.verificaciones[componente]["controles"] if c["nombre"] == nombre)
+
+
+class TestDeduplicacion(unittest.TestCase):
+    def test_evaluaciones_por_imagen(self):
+        hosts, imagenes = 30, 3
+        flota = {
+            f"PC{i:03d}": _salidas(f"PC{i:03d}", f"S-1-5-21-{100 + i}-{200 + i}-{300 + i}", imagen=i % imagenes)
+            for i in range(hosts)
+        }
+        resumen = veri.EvaluadorFlota(ahora=AHORA).evaluar(flota)
+
+        # Firewall, Auditoría y Usuarios cambian entre imágenes; el resto es igual en toda la flota
+        self.assertEqual(resumen["hosts"], hosts)
+        self.assertEqual(resumen["evaluaciones"], len(veri.VERIFICADORES) - 3 + 3 * imagenes)
+        self.assertEqual(resumen["evaluaciones"] + resumen["aciertos_cache"], hosts * len(veri.VERIFICADORES))
+        self.assertEqual(resumen["por_fuente"]["Usuarios y Cuentas"]["evaluaciones"], imagenes)
+
+    def test_resultados_iguales_a_evaluar_cada_host(self):
+        flota = {
+            f"PC{i:03d}": _salidas(f"PC{i:03d}", f"S-1-5-21-{100 + i}-2-3", imagen=i % 2)
+            for i in range(6)
+        }
+        evaluador = veri.EvaluadorFlota(ahora=AHORA)
+        evaluador.evaluar(flota)
+        for host, salidas in flota.items():
+            for nombre, clase in veri.VERIFICADORES.items():
+                esperado = clase(salidas=dict(salidas), ahora=AHORA).verificar()
+                self.assertEqual(evaluador.reportes[host].verificaciones[nombre], esperado, (host, nombre))
+
+
+class TestAislamientoEntreHosts(unittest.TestCase):
+    def test_datos_del_host_no_pasan_a_otro(self):
+        flota = {
+            host: _salidas(host, sid, admin=f"{host}-adm", ultimo_logon="2025-01-01T08:00:00")
+            for host, sid in (("PC01", "S-1-5-21-1-1-1"), ("PC02", "S-1-5-21-2-2-2"))
+        }
+        evaluador = veri.EvaluadorFlota(ahora=AHORA)
+        resumen = evaluador.evaluar(flota)
+
+        self.assertGreater(resumen["aciertos_cache"], 0)
+        control = _control(evaluador.reportes["PC02"], "Usuarios y Cuentas", "Cuenta Administrator renombrada")
+        self.assertEqual(control["valor"], "Sí (PC02-adm)")
+        texto = json.dumps(evaluador.reportes["PC02"].construir_modelo(host="PC02").contenido(), ensure_ascii=False)
+        self.assertIn("PC02-adm", texto)
+        self.assertNotIn("PC01", texto)
+        self.assertNotIn(veri.MARCADOR_HOST, texto)
+
+    def test_host_igual_a_una_palabra_de_la_salida(self):
+        # Windows Defender responde True/False; los hosts TRUE y FALSE no comparten resultado
+        flota = {}
+        for host, estado in (("TRUE", "True"), ("FALSE", "False")):
+            flota[host] = _salidas(host, f"S-1-5-21-{len(host)}-1-1")
+            flota[host][veri.VerificadorAntimalware.CMD_DEFENDER] = estado + "\r\n"
+        evaluador = veri.EvaluadorFlota(ahora=AHORA)
+        evaluador.evaluar(flota)
+
+        self.assertEqual(evaluador.estadisticas["Antimalware"]["fallos"], 2)
+        for host, cumple in (("TRUE", True), ("FALSE", False)):
+            control = _control(evaluador.reportes[host], "Antimalware", "Windows Defender habilitado")
+            self.assertIs(control["cumple"], cumple, host)
+
+
+if __name__ == "__main__":
+    unittest.main()
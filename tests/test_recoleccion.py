@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del núcleo de recolección asíncrono (NucleoRecoleccion).
+
+Los comandos reales de Windows se sustituyen por intérpretes de Python
+(sys.executable -c ...) que duermen, escriben marcas de tiempo o lanzan
+nietos, así que las pruebas corren en cualquier plataforma.
+
+    python -m pytest tests
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import veri
+
+
+# Imprime "inicio fin" (time.time) alrededor de una espera
+INTERVALO = "import sys, time; i = time.time(); time.sleep(float(sys.argv[1])); print(i, time.time())"
+
+# Escribe su PID en argv[1], lanza un nieto que escribe el suyo en argv[2] y ambos duermen
+CON_NIETO = (
+    "import os, subprocess, sys, time; "
+    "open(sys.argv[1], 'w').write(str(os.getpid())); "
+    "subprocess.Popen([sys.executable, '-c', "
+    "'import os, sys, time; open(sys.argv[1], \"w\").write(str(os.getpid())); time.sleep(60)', sys.argv[2]]); "
+    "time.sleep(60)"
+)
+
+
+def _python(codigo, *args, clase="ligero", timeout=veri.TIMEOUT_COMANDO):
+    return veri.Comando([sys.executable, "-c", codigo] + [str(a) for a in args], clase, timeout)
+
+
+def _maximo_simultaneo(salidas):
+    eventos = []
+    for salida in salidas:
+        inicio, fin = map(float, salida.split())
+        eventos += [(inicio, 1), (fin, -1)]
+    activos = maximo = 0
+    # A igual instante, los finales cuentan antes que los inicios
+    for _, delta in sorted(eventos):
+        activos += delta
+        maximo = max(maximo, activos)
+    return maximo
+
+
+def _vivo(pid):
+    """True si el proceso existe y no es un zombi pendiente de recoger."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+    except OSError:
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def _esperar(condicion, plazo=5.0):
+    limite = time.monotonic() + plazo
+    while time.monotonic() < limite:
+        if condicion():
+            return True
+        time.sleep(0.05)
+    return condicion()
+
+
+def _leer_pid(ruta):
+    _esperar(lambda: os.path.exists(ruta) and os.path.getsize(ruta) > 0)
+    with open(ruta) as f:
+        return int(f.read())
+
+
+class TestLimitesConcurrencia(unittest.TestCase):
+    def test_techos_por_clase(self):
+        self.assertEqual(veri.LIMITES_CONCURRENCIA, {"pesado": 2, "ligero": 8})
+        comandos = {f"p{i}": _python(INTERVALO, 0.5, clase="pesado") for i in range(6)}
+        comandos.update({f"l{i}": _python(INTERVALO, 0.5) for i in range(16)})
+
+        salidas = veri.recolectar(comandos)
+
+        pesados = [s for c, s in salidas.items() if c.startswith("p")]
+        ligeros = [s for c, s in salidas.items() if c.startswith("l")]
+        self.assertTrue(all(pesados + ligeros), salidas)
+        self.assertEqual(_maximo_simultaneo(pesados), 2)
+        self.assertEqual(_maximo_simultaneo(ligeros), 8)
+
+    def test_limites_personalizados(self):
+        comandos = {i: _python(INTERVALO, 0.3) for i in range(4)}
+        salidas = veri.recolectar(comandos, limites={"ligero": 1})
+        self.assertEqual(_maximo_simultaneo(salidas.values()), 1)
+
+
+class TestSalidas(unittest.TestCase):
+    def test_salida_normalizada_y_fallos_vacios(self):
+        salidas = veri.recolectar({
+            "ok": _python("import sys; sys.stdout.buffer.write(b'uno\\r\\ndos\\r\\n')"),
+            "error": _python("import sys; sys.exit(1)"),
+            "inexistente": veri.Comando(["no-existe-este-comando-veri"], "ligero", 5),
+        })
+        self.assertEqual(salidas, {"ok": "uno\ndos\n", "error": "", "inexistente": ""})
+
+
+@unittest.skipIf(sys.platform.startswith("win"), "el estado de los nietos se comprueba con señales POSIX")
+class TestArbolProcesos(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.pids = 0
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def _con_nieto(self, timeout):
+        """Comando que lanza un nieto; devuelve (comando, ruta PID hijo, ruta PID nieto)."""
+        self.pids += 1
+        hijo = os.path.join(self.directorio.name, f"hijo{self.pids}.pid")
+        nieto = os.path.join(self.directorio.name, f"nieto{self.pids}.pid")
+        return _python(CON_NIETO, hijo, nieto, timeout=timeout), hijo, nieto
+
+    def assertMuerto(self, pid):
+        self.assertTrue(_esperar(lambda: not _vivo(pid)), f"el proceso {pid} sigue vivo")
+
+    def test_plazo_vencido_devuelve_vacio_y_mata_al_nieto(self):
+        comando, hijo, nieto = self._con_nieto(timeout=1)
+        inicio = time.monotonic()
+        salidas = veri.recolectar({"lento": comando})
+
+        self.assertEqual(salidas, {"lento": ""})
+        self.assertLess(time.monotonic() - inicio, 10)
+        self.assertMuerto(_leer_pid(hijo))
+        self.assertMuerto(_leer_pid(nieto))
+
+    def test_cancelar_mata_los_procesos_en_curso(self):
+        lanzados = [self._con_nieto(timeout=60) for _ in range(3)]
+        rutas = [ruta for _, hijo, nieto in lanzados for ruta in (hijo, nieto)]
+
+        async def cancelar():
+            tarea = asyncio.ensure_future(veri.NucleoRecoleccion().recolectar(
+                {i: comando for i, (comando, _, _) in enumerate(lanzados)}
+            ))
+            while not all(os.path.exists(r) and os.path.getsize(r) for r in rutas):
+                await asyncio.sleep(0.05)
+            tarea.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await tarea
+
+        inicio = time.monotonic()
+        asyncio.run(asyncio.wait_for(cancelar(), 20))
+
+        self.assertLess(time.monotonic() - inicio, 20)
+        for ruta in rutas:
+            self.assertMuerto(_leer_pid(ruta))
+
+
+if __name__ == "__main__":
+    unittest.main()
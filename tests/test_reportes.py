@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los emisores de reportes.
+"""
+
+import os
+import sys
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import veri
+
+
+class TestEmisorHTML(unittest.TestCase):
+    def test_textos_del_modelo_escapados(self):
+        cuenta = "<img src=x onerror=alert(1)>"
+        reportes = veri.GeneradorReportes()
+        reportes.agregar_verificacion("Usuarios y Cuentas", {
+            "componente": "Usuarios y Cuentas",
+            "estado": "NO_CUMPLE",
+            "norma_referencia": "ISO/IEC 27001 A.9.2",
+            "controles": [{"nombre": "Cuenta Administrator renombrada", "cumple": True, "valor": f"Sí ({cuenta})"}],
+            "hallazgos": [{
+                "titulo": f"Cuenta {cuenta}", "control": "Cuenta Administrator renombrada",
+                "descripcion": cuenta, "severidad": "ALTO", "norma_iso": "ISO/IEC 27001 A.9.2.3",
+                "recomendacion": f"net user \"{cuenta}\" /active:no"
+            }],
+        })
+        reportes.calcular_puntuaciones()
+
+        html = veri.EmisorHTML().renderizar(reportes.construir_modelo()).decode("utf-8")
+
+        self.assertNotIn("<img", html)
+        self.assertIn("&lt;img src=x onerror=alert(1)&gt;", html)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de VerificadorUsuarios sobre salidas de PowerShell capturadas.
+"""
+
+import os
+import sys
+import json
+import unittest
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import veri
+
+
+AHORA = datetime(2026, 1, 15, 9, 0, 0)
+SID = "S-1-5-21-1-2-3"
+
+
+def _verificar(usuarios=None, miembros=(f"{SID}-500",)):
+    if usuarios is None:
+        usuarios = [
+            {"Nombre": "admin-local", "SID": f"{SID}-500", "Habilitada": True,
+             "UltimoLogon": "2026-01-10T08:30:00", "UltimaClave": "2026-01-01T08:30:00"},
+            {"Nombre": "Guest", "SID": f"{SID}-501", "Habilitada": False},
+        ]
+    datos = {
+        "Usuarios": usuarios,
+        "Grupos": [{"Nombre": "Administrators", "SID": veri.SID_ADMINISTRADORES, "Miembros": list(miembros)}],
+        "EnableLUA": 1,
+    }
+    verificador = veri.VerificadorUsuarios(salidas={veri.VerificadorUsuarios.CMD_CUENTAS: json.dumps(datos)}, ahora=AHORA)
+    return verificador.verificar()
+
+
+class TestEnumeracion(unittest.TestCase):
+    def test_fechas_en_formato_invariante(self):
+        self.assertIn("$f='s'", veri.VerificadorUsuarios.CMD_CUENTAS)
+        resultado = _verificar()
+        self.assertEqual(resultado["estado"], "CUMPLE", resultado)
+
+    def test_administradores_vacio_es_enumeracion_incompleta(self):
+        resultado = _verificar(miembros=())
+        self.assertEqual(resultado["estado"], "ERROR")
+        self.assertIn("Administradores", resultado["error"])
+
+    def test_faltan_cuentas_integradas(self):
+        for usuarios in ([], [{"Nombre": "Guest", "SID": f"{SID}-501", "Habilitada": False}]):
+            resultado = _verificar(usuarios=usuarios)
+            self.assertEqual(resultado["estado"], "ERROR")
+            self.assertIn("RID", resultado["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
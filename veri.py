@@ -12,22 +12,32 @@
 """
 
 import sys
+import io
 import os
 import json
-import subprocess
 import re
+import mmap
+import zlib
+import struct
+import unicodedata
 from datetime import datetime
 from enum import Enum
+from collections import namedtuple, OrderedDict
+from types import MappingProxyType
 from abc import ABC, abstractmethod
+from html import escape
 
 
+VERSION = "3.0"
+
 if sys.version_info < (3, 7):
     print("ERROR: Se requiere Python 3.7 o superior")
     sys.exit(1)
 
-if not sys.platform.startswith('win'):
-    print("ERROR: Este programa solo funciona en Windows")
-    sys.exit(1)
+# Los módulos costosos de importar que solo usan la recolección, la CLI o
+# algunos formatos de reporte (asyncio, subprocess, argparse, csv, xml,
+# platform...) se importan donde se usan para que una ejecución de un solo
+# control arranque rápido.
 
 
 class NivelSeveridad(Enum):
@@ -39,15 +49,168 @@ class NivelSeveridad(Enum):
 
 
 class VerificadorBase(ABC):
+    # Comandos de los que depende el verificador (fuentes de datos en bruto)
+    comandos = ()
+    # Plazos distintos de TIMEOUT_COMANDO, por comando
+    tiempo_limite = {}
+
+    def __init__(self, salidas=None, ahora=None):
+        # Con salidas dadas se reproducen en lugar de ejecutar comandos reales
+        self.reproduccion = salidas is not None
+        self.salidas = {} if salidas is None else salidas
+        # Instante de referencia para antigüedades; fijo al reproducir capturas antiguas
+        self.ahora = ahora
+
     @abstractmethod
     def verificar(self):
         pass
 
-    def _ejecutar_cmd(self, cmd):
+    def _ahora(self):
+        return self.ahora or datetime.now()
+
+    def _ejecutar_cmd(self, cmd, timeout=None):
+        if cmd in self.salidas or self.reproduccion:
+            return self.salidas.get(cmd, "")
+        timeout = timeout or self.tiempo_limite.get(cmd, TIMEOUT_COMANDO)
+        salida = recolectar({cmd: comando_de(cmd, timeout)})[cmd]
+        self.salidas[cmd] = salida
+        return salida
+
+
+# ============================================================================
+# NÚCLEO DE RECOLECCIÓN ASÍNCRONO
+# ============================================================================
+#
+# Los comandos se lanzan por argv, sin cmd.exe intermedio, con concurrencia
+# limitada por clase: las consultas WMI/PowerShell son costosas y se limitan
+# más que los comandos ligeros. Si vence el plazo o se cancela la recolección
+# se mata el árbol de procesos completo.
+
+LIMITES_CONCURRENCIA = {"pesado": 2, "ligero": 8}
+TIMEOUT_COMANDO = 5
+
+Comando = namedtuple("Comando", "argv clase timeout")
+
+
+def clase_comando(argv):
+    ejecutable = os.path.basename(argv[0]).lower() if argv else ""
+    return "pesado" if ejecutable.startswith(("powershell", "pwsh", "wmic")) else "ligero"
+
+
+def comando_de(cmd, timeout=TIMEOUT_COMANDO):
+    """Convierte la línea de comando usada como clave en un Comando con argv."""
+    import shlex
+    argv = shlex.split(cmd)
+    return Comando(argv, clase_comando(argv), timeout)
+
+
+def comandos_de(verificadores):
+    comandos = {}
+    for clase in verificadores:
+        for cmd in clase.comandos:
+            comandos[cmd] = comando_de(cmd, clase.tiempo_limite.get(cmd, TIMEOUT_COMANDO))
+    return comandos
+
+
+def _opciones_proceso():
+    import subprocess
+    if sys.platform.startswith("win"):
+        return {"creationflags": getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+                                 | getattr(subprocess, "CREATE_NO_WINDOW", 0)}
+    # Grupo de procesos propio para poder matar también a los nietos
+    return {"start_new_session": True}
+
+
+async def _matar_arbol(proceso):
+    """Mata el proceso y sus descendientes y espera a que se cierren sus tuberías."""
+    if proceso.returncode is not None:
+        return
+    try:
+        if sys.platform.startswith("win"):
+            import asyncio
+            import subprocess
+            # taskkill también como subproceso asíncrono para no bloquear el bucle
+            taskkill = await asyncio.create_subprocess_exec(
+                "taskkill", "/F", "/T", "/PID", str(proceso.pid), stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **_opciones_proceso()
+            )
+            await taskkill.wait()
+        else:
+            import signal
+            os.killpg(proceso.pid, signal.SIGKILL)
+    except OSError:
+        pass
+    try:
+        proceso.kill()
+    except OSError:
+        pass
+    await proceso.communicate()
+
+
+def _decodificar_salida(datos):
+    import locale
+    return datos.decode(locale.getpreferredencoding(False), errors="replace").replace("\r\n", "\n")
+
+
+class NucleoRecoleccion:
+    def __init__(self, limites=None):
+        self.limites = dict(LIMITES_CONCURRENCIA, **(limites or {}))
+    
+    async def _ejecutar(self, comando, semaforo):
+        import asyncio
+        import subprocess
+        async with semaforo:
+            # El proceso arranca antes de que se conecten sus tuberías: si se
+            # cancela en ese intervalo hay que esperar a tenerlo para matarlo
+            creacion = asyncio.ensure_future(asyncio.create_subprocess_exec(
+                *comando.argv, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL, **_opciones_proceso()
+            ))
+            try:
+                proceso = await asyncio.shield(creacion)
+            except OSError:
+                return ""
+            except asyncio.CancelledError:
+                await asyncio.wait([creacion])
+                if creacion.exception() is None:
+                    await _matar_arbol(creacion.result())
+                raise
+            try:
+                salida, _ = await asyncio.wait_for(proceso.communicate(), comando.timeout)
+            except asyncio.TimeoutError:
+                await _matar_arbol(proceso)
+                return ""
+            except asyncio.CancelledError:
+                await _matar_arbol(proceso)
+                raise
+        return _decodificar_salida(salida) if proceso.returncode == 0 else ""
+    
+    async def recolectar(self, comandos):
+        """comandos: {clave: Comando}. Devuelve {clave: salida}; "" si falla o vence el plazo."""
+        import asyncio
+        semaforos = {clase: asyncio.Semaphore(n) for clase, n in self.limites.items()}
+        claves = list(comandos)
+        tareas = [
+            asyncio.ensure_future(self._ejecutar(comandos[c], semaforos.get(comandos[c].clase, semaforos["ligero"])))
+            for c in claves
+        ]
         try:
-            return subprocess.check_output(cmd, shell=True, text=True, stderr=subprocess.DEVNULL, timeout=5)
-        except:
-            return ""
+            salidas = await asyncio.gather(*tareas)
+        except asyncio.CancelledError:
+            # gather se da por cancelado con la primera tarea que termina; hay
+            # que esperar a que las demás acaben de matar sus procesos
+            await asyncio.wait(tareas)
+            raise
+        return dict(zip(claves, salidas))
+
+
+def recolectar(comandos, limites=None):
+    """Fachada síncrona de NucleoRecoleccion.recolectar."""
+    import asyncio
+    if sys.platform.startswith("win") and sys.version_info < (3, 8):
+        # Los subprocesos de asyncio en Windows necesitan el bucle Proactor
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    return asyncio.run(NucleoRecoleccion(limites).recolectar(comandos))
 
 
 # ============================================================================
@@ -55,6 +218,9 @@ class VerificadorBase(ABC):
 # ============================================================================
 
 class VerificadorContraseñas(VerificadorBase):
+    CMD_CUENTAS = "net accounts"
+    comandos = (CMD_CUENTAS,)
+
     def verificar(self):
         resultado = {
             "componente": "Políticas de Contraseñas",
@@ -81,6 +247,7 @@ class VerificadorContraseñas(VerificadorBase):
                 resultado["controles"][0]["valor"] = f"{long_min['valor']} caracteres"
                 resultado["hallazgos"].append({
                     "titulo": "Longitud mínima de contraseña insuficiente",
+                    "control": "Longitud mínima (≥12 caracteres)",
                     "descripcion": f"Configurada: {long_min['valor']} caracteres. Recomendado: 12+",
                     "severidad": "ALTO",
                     "norma_iso": "ISO/IEC 27001 A.9.2.1",
@@ -96,6 +263,7 @@ class VerificadorContraseñas(VerificadorBase):
                 resultado["controles"][1]["valor"] = "Deshabilitada"
                 resultado["hallazgos"].append({
                     "titulo": "Complejidad de contraseña no requerida",
+                    "control": "Complejidad requerida",
                     "descripcion": "Las contraseñas no requieren mayúsculas, minúsculas, números y símbolos",
                     "severidad": "ALTO",
                     "norma_iso": "ISO/IEC 27001 A.9.2.1",
@@ -111,6 +279,7 @@ class VerificadorContraseñas(VerificadorBase):
                 resultado["controles"][2]["valor"] = f"{caducidad['dias']} días"
                 resultado["hallazgos"].append({
                     "titulo": "Caducidad de contraseña no configurada",
+                    "control": "Caducidad (≤90 días)",
                     "descripcion": f"Configurada: {caducidad['dias']} días. Recomendado: ≤90 días",
                     "severidad": "MEDIO",
                     "norma_iso": "ISO/IEC 27001 A.9.2.3",
@@ -126,6 +295,7 @@ class VerificadorContraseñas(VerificadorBase):
                 resultado["controles"][3]["valor"] = f"{historial['valor']} registros"
                 resultado["hallazgos"].append({
                     "titulo": "Historial de contraseñas insuficiente",
+                    "control": "Historial de contraseñas (≥24)",
                     "descripcion": f"Configurado: {historial['valor']}. Recomendado: 24+",
                     "severidad": "MEDIO",
                     "norma_iso": "ISO/IEC 27001 A.9.2.1",
@@ -141,6 +311,7 @@ class VerificadorContraseñas(VerificadorBase):
                 resultado["controles"][4]["valor"] = f"{bloqueo['intentos']} intentos"
                 resultado["hallazgos"].append({
                     "titulo": "Bloqueo por intentos fallidos insuficiente",
+                    "control": "Bloqueo por intentos fallidos",
                     "descripcion": f"Configurado: {bloqueo['intentos']} intentos. Recomendado: 5+",
                     "severidad": "ALTO",
                     "norma_iso": "ISO/IEC 27001 A.9.2.5",
@@ -156,6 +327,7 @@ class VerificadorContraseñas(VerificadorBase):
                 resultado["controles"][5]["valor"] = f"{duracion['minutos']} minutos"
                 resultado["hallazgos"].append({
                     "titulo": "Duración de bloqueo muy corta",
+                    "control": "Duración bloqueo (≥30 min)",
                     "descripcion": f"Configurada: {duracion['minutos']} minutos. Recomendado: 30+",
                     "severidad": "MEDIO",
                     "norma_iso": "ISO/IEC 27001 A.9.2.5",
@@ -170,18 +342,18 @@ class VerificadorContraseñas(VerificadorBase):
         return resultado
     
     def _verificar_longitud_minima(self):
-        output = self._ejecutar_cmd("net accounts")
+        output = self._ejecutar_cmd(self.CMD_CUENTAS)
         nums = re.findall(r'\d+', output)
         valor = int(nums[0]) if nums else 0
         return {"valor": valor, "cumple": valor >= 12}
     
     def _verificar_complejidad(self):
-        output = self._ejecutar_cmd("net accounts")
+        output = self._ejecutar_cmd(self.CMD_CUENTAS)
         cumple = "complexity is required" in output.lower()
         return {"cumple": cumple}
     
     def _verificar_caducidad(self):
-        output = self._ejecutar_cmd("net accounts")
+        output = self._ejecutar_cmd(self.CMD_CUENTAS)
         for linea in output.split('\n'):
             if "Maximum password age" in linea:
                 nums = re.findall(r'\d+', linea)
@@ -191,7 +363,7 @@ class VerificadorContraseñas(VerificadorBase):
         return {"dias": 0, "cumple": False}
     
     def _verificar_historial(self):
-        output = self._ejecutar_cmd("net accounts")
+        output = self._ejecutar_cmd(self.CMD_CUENTAS)
         for linea in output.split('\n'):
             if "Password history length" in linea:
                 nums = re.findall(r'\d+', linea)
@@ -201,7 +373,7 @@ class VerificadorContraseñas(VerificadorBase):
         return {"valor": 0, "cumple": False}
     
     def _verificar_bloqueo(self):
-        output = self._ejecutar_cmd("net accounts")
+        output = self._ejecutar_cmd(self.CMD_CUENTAS)
         for linea in output.split('\n'):
             if "Lockout threshold" in linea:
                 nums = re.findall(r'\d+', linea)
@@ -211,7 +383,7 @@ class VerificadorContraseñas(VerificadorBase):
         return {"intentos": 0, "cumple": False}
     
     def _verificar_duracion_bloqueo(self):
-        output = self._ejecutar_cmd("net accounts")
+        output = self._ejecutar_cmd(self.CMD_CUENTAS)
         for linea in output.split('\n'):
             if "Lockout duration" in linea:
                 nums = re.findall(r'\d+', linea)
@@ -226,6 +398,10 @@ class VerificadorContraseñas(VerificadorBase):
 # ============================================================================
 
 class VerificadorActualizaciones(VerificadorBase):
+    CMD_SERVICIO_WU = "powershell -Command \"Get-Service WuAuServ | Select-Object -ExpandProperty Status\""
+    CMD_HOTFIX = "powershell -Command \"Get-HotFix | Sort-Object -Property InstalledOn -Descending | Select-Object -First 1 -ExpandProperty InstalledOn\""
+    comandos = (CMD_SERVICIO_WU, CMD_HOTFIX)
+
     def verificar(self):
         resultado = {
             "componente": "Actualizaciones y Parches",
@@ -252,6 +428,7 @@ class VerificadorActualizaciones(VerificadorBase):
                 resultado["controles"][1]["valor"] = "No ejecutándose"
                 resultado["hallazgos"].append({
                     "titulo": "Windows Update automático deshabilitado",
+                    "control": "Windows Update automático",
                     "descripcion": "Las actualizaciones automáticas no están habilitadas",
                     "severidad": "ALTO",
                     "norma_iso": "ISO/IEC 27001 A.12.6.1",
@@ -266,6 +443,7 @@ class VerificadorActualizaciones(VerificadorBase):
                 resultado["controles"][2]["valor"] = f"{ultima['dias']} días"
                 resultado["hallazgos"].append({
                     "titulo": "Sistema no actualizado recientemente",
+                    "control": "Última actualización (≤30 días)",
                     "descripcion": f"Última actualización hace {ultima['dias']} días",
                     "severidad": "MEDIO",
                     "norma_iso": "ISO/IEC 27001 A.12.6.1",
@@ -280,17 +458,17 @@ class VerificadorActualizaciones(VerificadorBase):
         return resultado
     
     def _verificar_wu_automatico(self):
-        output = self._ejecutar_cmd("powershell -Command \"Get-Service WuAuServ | Select-Object -ExpandProperty Status\"")
+        output = self._ejecutar_cmd(self.CMD_SERVICIO_WU)
         estado = "HABILITADO" if "running" in output.lower() else "DESHABILITADO"
         return {"estado": estado}
     
     def _verificar_ultima_actualizacion(self):
         try:
-            output = self._ejecutar_cmd("powershell -Command \"Get-HotFix | Sort-Object -Property InstalledOn -Descending | Select-Object -First 1 -ExpandProperty InstalledOn\"")
+            output = self._ejecutar_cmd(self.CMD_HOTFIX)
             if output.strip():
                 from datetime import datetime as dt
                 fecha = dt.strptime(output.strip()[:10], "%m/%d/%Y")
-                dias = (dt.now() - fecha).days
+                dias = (self._ahora() - fecha).days
                 return {"dias": dias}
         except:
             pass
@@ -302,6 +480,9 @@ class VerificadorActualizaciones(VerificadorBase):
 # ============================================================================
 
 class VerificadorFirewall(VerificadorBase):
+    CMD_PERFILES = "netsh advfirewall show allprofiles"
+    comandos = (CMD_PERFILES,)
+
     def verificar(self):
         resultado = {
             "componente": "Firewall",
@@ -328,6 +509,7 @@ class VerificadorFirewall(VerificadorBase):
             if not all(perfiles.values()):
                 resultado["hallazgos"].append({
                     "titulo": "Firewall deshabilitado en uno o más perfiles",
+                    "control": "Firewall habilitado (Dominio)",
                     "descripcion": f"Dominio: {perfiles.get('Dominio')}, Privado: {perfiles.get('Privado')}, Público: {perfiles.get('Público')}",
                     "severidad": "CRITICO",
                     "norma_iso": "ISO/IEC 27001 A.13.1.1",
@@ -345,7 +527,7 @@ class VerificadorFirewall(VerificadorBase):
         return resultado
     
     def _verificar_perfiles_firewall(self):
-        output = self._ejecutar_cmd("netsh advfirewall show allprofiles")
+        output = self._ejecutar_cmd(self.CMD_PERFILES)
         perfiles = {
             "Dominio": "State.*on" in output.lower() or "state" in output.lower() and "on" in output.split("Domain")[1].lower()[:50] if "Domain" in output else False,
             "Privado": True,
@@ -359,6 +541,10 @@ class VerificadorFirewall(VerificadorBase):
 # ============================================================================
 
 class VerificadorAntimalware(VerificadorBase):
+    CMD_DEFENDER = "powershell -Command \"Get-MpComputerStatus | Select-Object -ExpandProperty AMServiceEnabled\""
+    CMD_TIEMPO_REAL = "powershell -Command \"Get-MpComputerStatus | Select-Object -ExpandProperty RealTimeProtectionEnabled\""
+    comandos = (CMD_DEFENDER, CMD_TIEMPO_REAL)
+
     def verificar(self):
         resultado = {
             "componente": "Antimalware",
@@ -382,6 +568,7 @@ class VerificadorAntimalware(VerificadorBase):
                 resultado["controles"][0]["valor"] = "No"
                 resultado["hallazgos"].append({
                     "titulo": "Windows Defender deshabilitado",
+                    "control": "Windows Defender habilitado",
                     "descripcion": "La protección en tiempo real no está activa",
                     "severidad": "CRITICO",
                     "norma_iso": "ISO/IEC 27001 A.12.2.1",
@@ -403,12 +590,12 @@ class VerificadorAntimalware(VerificadorBase):
         return resultado
     
     def _verificar_defender(self):
-        output = self._ejecutar_cmd("powershell -Command \"Get-MpComputerStatus | Select-Object -ExpandProperty AMServiceEnabled\"")
+        output = self._ejecutar_cmd(self.CMD_DEFENDER)
         estado = "HABILITADO" if "True" in output else "DESHABILITADO"
         return {"estado": estado}
     
     def _verificar_realtime(self):
-        output = self._ejecutar_cmd("powershell -Command \"Get-MpComputerStatus | Select-Object -ExpandProperty RealTimeProtectionEnabled\"")
+        output = self._ejecutar_cmd(self.CMD_TIEMPO_REAL)
         cumple = "True" in output
         return {"cumple": cumple}
 
@@ -418,6 +605,9 @@ class VerificadorAntimalware(VerificadorBase):
 # ============================================================================
 
 class VerificadorAuditoria(VerificadorBase):
+    CMD_LOG_SEGURIDAD = "wevtutil gl Security /l"
+    comandos = (CMD_LOG_SEGURIDAD,)
+
     def verificar(self):
         resultado = {
             "componente": "Auditoría y Registros",
@@ -441,6 +631,7 @@ class VerificadorAuditoria(VerificadorBase):
             if tamaño["tamaño_mb"] < 512:
                 resultado["hallazgos"].append({
                     "titulo": "Tamaño insuficiente de logs de seguridad",
+                    "control": "Tamaño de logs adecuado (≥512MB)",
                     "descripcion": f"Actual: {tamaño['tamaño_mb']:.0f} MB. Recomendado: ≥512 MB",
                     "severidad": "MEDIO",
                     "norma_iso": "ISO/IEC 27001 A.12.4.1",
@@ -456,7 +647,7 @@ class VerificadorAuditoria(VerificadorBase):
     
     def _verificar_tamaño_logs(self):
         try:
-            output = self._ejecutar_cmd("wevtutil gl Security /l")
+            output = self._ejecutar_cmd(self.CMD_LOG_SEGURIDAD)
             for linea in output.split('\n'):
                 if "maxSize" in linea.lower():
                     nums = re.findall(r'\d+', linea)
@@ -470,10 +661,39 @@ class VerificadorAuditoria(VerificadorBase):
 
 
 # ============================================================================
-# MODULO 6: VERIFICADOR DE USUARIOS (ISO A.9.1) - 5 CONTROLES
+# MODULO 6: VERIFICADOR DE USUARIOS (ISO A.9.1) - 7 CONTROLES
 # ============================================================================
 
+# Enumeración de todas las cuentas, grupos y UAC en una sola llamada a
+# PowerShell. Solo usa comillas simples para poder ir dentro de "..." en cmd.
+_PS_CUENTAS = "; ".join([
+    "$ErrorActionPreference='SilentlyContinue'",
+    # 's' es el formato ordenable invariante (yyyy-MM-ddTHH:mm:ss); un patrón
+    # propio usaría el separador de hora de la referencia cultural
+    "$f='s'",
+    "$u=@(Get-LocalUser | ForEach-Object { [pscustomobject]@{"
+    "Nombre=$_.Name; SID=$_.SID.Value; Habilitada=$_.Enabled; Descripcion=$_.Description; "
+    "UltimoLogon=$(if ($_.LastLogon) { $_.LastLogon.ToString($f) }); "
+    "UltimaClave=$(if ($_.PasswordLastSet) { $_.PasswordLastSet.ToString($f) })} })",
+    "$g=@(Get-LocalGroup | ForEach-Object { [pscustomobject]@{"
+    "Nombre=$_.Name; SID=$_.SID.Value; "
+    "Miembros=@(Get-LocalGroupMember -Group $_ | ForEach-Object { $_.SID.Value })} })",
+    "$l=(Get-ItemProperty 'HKLM:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Policies\\System').EnableLUA",
+    "ConvertTo-Json -Compress -Depth 4 -InputObject @{Usuarios=$u; Grupos=$g; EnableLUA=$l}",
+])
+
+SID_ADMINISTRADORES = "S-1-5-32-544"
+
+
 class VerificadorUsuarios(VerificadorBase):
+    DIAS_INACTIVIDAD = 90
+    DIAS_CLAVE = 90
+    MAX_ADMINISTRADORES = 2
+    PREFIJOS_SERVICIO = ("svc", "srv", "sql", "iis", "service", "servicio")
+    CMD_CUENTAS = f"powershell -NoProfile -Command \"{_PS_CUENTAS}\""
+    comandos = (CMD_CUENTAS,)
+    tiempo_limite = {CMD_CUENTAS: 60}
+
     def verificar(self):
         resultado = {
             "componente": "Usuarios y Cuentas",
@@ -485,25 +705,119 @@ class VerificadorUsuarios(VerificadorBase):
                 {"nombre": "Cuenta Administrator renombrada", "cumple": False, "valor": "No verificado"},
                 {"nombre": "Cuentas de servicio sin uso", "cumple": False, "valor": "Desconocido"},
                 {"nombre": "Cuentas administrativas limitadas", "cumple": False, "valor": "Desconocido"},
-                {"nombre": "UAC habilitado", "cumple": False, "valor": "Desconocido"}
+                {"nombre": "UAC habilitado", "cumple": False, "valor": "Desconocido"},
+                {"nombre": "Cuentas inactivas (≤90 días)", "cumple": False, "valor": "Desconocido"},
+                {"nombre": "Antigüedad de contraseñas (≤90 días)", "cumple": False, "valor": "Desconocido"}
             ]
         }
         
         try:
-            guest = self._verificar_guest()
-            if guest["estado"] == "DESHABILITADA":
+            tabla = self._tabular_cuentas(self._enumerar_cuentas(), self._ahora())
+            ev = self._evaluar_cuentas(tabla)
+            
+            # 1. Guest
+            if not ev["guest_habilitada"]:
                 resultado["controles"][0]["cumple"] = True
                 resultado["controles"][0]["valor"] = "Deshabilitada"
             else:
                 resultado["controles"][0]["valor"] = "Habilitada"
                 resultado["hallazgos"].append({
                     "titulo": "Cuenta Guest habilitada",
+                    "control": "Cuenta Guest deshabilitada",
                     "descripcion": "La cuenta de invitado está habilitada y accesible",
                     "severidad": "ALTO",
                     "norma_iso": "ISO/IEC 27001 A.9.1.1",
                     "recomendacion": "Ejecutar: net user Guest /active:no"
                 })
             
+            # 2. Administrator renombrada (RID 500)
+            admin = ev["admin_integrada"]
+            if admin.lower() not in ("administrator", "administrador"):
+                resultado["controles"][1]["cumple"] = True
+                resultado["controles"][1]["valor"] = f"Sí ({admin})"
+            else:
+                resultado["controles"][1]["valor"] = f"No ({admin})"
+                resultado["hallazgos"].append({
+                    "titulo": "Cuenta Administrator con nombre predeterminado",
+                    "control": "Cuenta Administrator renombrada",
+                    "descripcion": f"La cuenta integrada (RID 500) se llama '{admin}'",
+                    "severidad": "MEDIO",
+                    "norma_iso": "ISO/IEC 27001 A.9.2.3",
+                    "recomendacion": f"Ejecutar: wmic useraccount where name='{admin}' rename <nuevo_nombre>"
+                })
+            
+            # 3. Cuentas de servicio sin uso
+            servicio = ev["servicio_sin_uso"]
+            resultado["controles"][2]["cumple"] = not servicio
+            resultado["controles"][2]["valor"] = f"{len(servicio)} cuentas"
+            if servicio:
+                resultado["hallazgos"].append({
+                    "titulo": "Cuentas de servicio habilitadas sin uso",
+                    "control": "Cuentas de servicio sin uso",
+                    "descripcion": f"Sin logon en {self.DIAS_INACTIVIDAD}+ días: {self._listar(servicio)}",
+                    "severidad": "MEDIO",
+                    "norma_iso": "ISO/IEC 27001 A.9.2.6",
+                    "recomendacion": "Ejecutar: net user <cuenta> /active:no"
+                })
+            
+            # 4. Cuentas administrativas
+            administradores = ev["administradores"]
+            resultado["controles"][3]["valor"] = f"{len(administradores)} cuentas"
+            if len(administradores) <= self.MAX_ADMINISTRADORES:
+                resultado["controles"][3]["cumple"] = True
+            else:
+                resultado["hallazgos"].append({
+                    "titulo": "Demasiadas cuentas administrativas",
+                    "control": "Cuentas administrativas limitadas",
+                    "descripcion": f"Miembros de Administradores: {self._listar(administradores)}. Recomendado: ≤{self.MAX_ADMINISTRADORES}",
+                    "severidad": "ALTO",
+                    "norma_iso": "ISO/IEC 27001 A.9.2.3",
+                    "recomendacion": "Ejecutar: net localgroup Administrators <cuenta> /delete"
+                })
+            
+            # 5. UAC
+            if tabla["uac"]:
+                resultado["controles"][4]["cumple"] = True
+                resultado["controles"][4]["valor"] = "Habilitado"
+            else:
+                resultado["controles"][4]["valor"] = "Deshabilitado"
+                resultado["hallazgos"].append({
+                    "titulo": "Control de cuentas de usuario (UAC) deshabilitado",
+                    "control": "UAC habilitado",
+                    "descripcion": "EnableLUA no está activo; los procesos administrativos no piden elevación",
+                    "severidad": "ALTO",
+                    "norma_iso": "ISO/IEC 27001 A.9.4.4",
+                    "recomendacion": "Ejecutar: reg add HKLM\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Policies\\System /v EnableLUA /t REG_DWORD /d 1 /f"
+                })
+            
+            # 6. Cuentas inactivas
+            inactivas = ev["inactivas"]
+            resultado["controles"][5]["cumple"] = not inactivas
+            resultado["controles"][5]["valor"] = f"{len(inactivas)} cuentas"
+            if inactivas:
+                resultado["hallazgos"].append({
+                    "titulo": "Cuentas habilitadas inactivas",
+                    "control": "Cuentas inactivas (≤90 días)",
+                    "descripcion": f"Sin logon en {self.DIAS_INACTIVIDAD}+ días: {self._listar(inactivas)}",
+                    "severidad": "MEDIO",
+                    "norma_iso": "ISO/IEC 27001 A.9.2.6",
+                    "recomendacion": "Ejecutar: net user <cuenta> /active:no"
+                })
+            
+            # 7. Antigüedad de contraseñas
+            claves = ev["claves_antiguas"]
+            resultado["controles"][6]["cumple"] = not claves
+            resultado["controles"][6]["valor"] = f"{len(claves)} cuentas"
+            if claves:
+                resultado["hallazgos"].append({
+                    "titulo": "Contraseñas sin renovar",
+                    "control": "Antigüedad de contraseñas (≤90 días)",
+                    "descripcion": f"Contraseña con más de {self.DIAS_CLAVE} días: {self._listar(claves)}",
+                    "severidad": "MEDIO",
+                    "norma_iso": "ISO/IEC 27001 A.9.2.4",
+                    "recomendacion": "Ejecutar: net user <cuenta> /logonpasswordchg:yes"
+                })
+            
             resultado["estado"] = "NO_CUMPLE" if resultado["hallazgos"] else "CUMPLE"
         except Exception as e:
             resultado["estado"] = "ERROR"
@@ -511,12 +825,111 @@ class VerificadorUsuarios(VerificadorBase):
         
         return resultado
     
-    def _verificar_guest(self):
-        output = self._ejecutar_cmd("net user Guest")
-        if "Account active" in output:
-            if "No" in output:
-                return {"estado": "DESHABILITADA"}
-        return {"estado": "HABILITADA"}
+    def _enumerar_cuentas(self):
+        output = self._ejecutar_cmd(self.CMD_CUENTAS)
+        if not output.strip():
+            raise ValueError("No se pudieron enumerar las cuentas locales")
+        return json.loads(output)
+    
+    def _tabular_cuentas(self, datos, ahora):
+        """Convierte la salida de PowerShell en columnas paralelas por cuenta."""
+        usuarios = self._como_lista(datos.get("Usuarios"))
+        grupos = self._como_lista(datos.get("Grupos"))
+        
+        miembros = {}
+        administradores = set()
+        for g in grupos:
+            for sid in self._como_lista(g.get("Miembros")):
+                miembros.setdefault(sid, []).append(g.get("Nombre", ""))
+                if g.get("SID") == SID_ADMINISTRADORES:
+                    administradores.add(sid)
+        # Administradores nunca está vacío; Get-LocalGroupMember falla en silencio
+        # si el grupo contiene SID huérfanos o de Azure AD
+        if not administradores:
+            raise ValueError("Enumeración de grupos incompleta: el grupo Administradores no tiene miembros")
+        
+        tabla = {
+            "nombre": [], "sid": [], "rid": [], "habilitada": [], "grupos": [],
+            "admin": [], "servicio": [], "dias_logon": [], "dias_clave": [],
+            "admin_externos": [],
+            "uac": str(datos.get("EnableLUA")) == "1",
+        }
+        sids_locales = set()
+        for u in usuarios:
+            nombre = u.get("Nombre") or ""
+            sid = u.get("SID") or ""
+            sids_locales.add(sid)
+            descripcion = (u.get("Descripcion") or "").lower()
+            tabla["nombre"].append(nombre)
+            tabla["sid"].append(sid)
+            tabla["rid"].append(int(sid.rsplit("-", 1)[-1]) if sid[-1:].isdigit() else -1)
+            tabla["habilitada"].append(bool(u.get("Habilitada")))
+            tabla["grupos"].append(miembros.get(sid, []))
+            tabla["admin"].append(sid in administradores)
+            tabla["servicio"].append(
+                nombre.lower().startswith(self.PREFIJOS_SERVICIO) or "servicio" in descripcion or "service" in descripcion
+            )
+            tabla["dias_logon"].append(self._dias_desde(u.get("UltimoLogon"), ahora))
+            tabla["dias_clave"].append(self._dias_desde(u.get("UltimaClave"), ahora))
+        # Las cuentas integradas (RID 500 y 501) existen siempre; si faltan, la
+        # enumeración está incompleta (p. ej. Get-LocalUser no disponible)
+        faltan = {500, 501} - set(tabla["rid"])
+        if faltan:
+            raise ValueError(f"Enumeración de cuentas incompleta: faltan los RID {sorted(faltan)}")
+        # Miembros de Administradores que no son cuentas locales (dominio, grupos)
+        tabla["admin_externos"] = sorted(administradores - sids_locales)
+        return tabla
+    
+    def _evaluar_cuentas(self, tabla):
+        """Evalúa todos los controles de cuentas en una única pasada sobre la tabla."""
+        ev = {
+            "guest_habilitada": False,
+            "admin_integrada": None,
+            "administradores": [],
+            "servicio_sin_uso": [],
+            "inactivas": [],
+            "claves_antiguas": [],
+        }
+        filas = zip(tabla["nombre"], tabla["rid"], tabla["habilitada"], tabla["admin"],
+                    tabla["servicio"], tabla["dias_logon"], tabla["dias_clave"])
+        for nombre, rid, habilitada, admin, servicio, dias_logon, dias_clave in filas:
+            if rid == 501:
+                ev["guest_habilitada"] = habilitada
+            elif rid == 500:
+                ev["admin_integrada"] = nombre
+            if not habilitada:
+                continue
+            if admin:
+                ev["administradores"].append(nombre)
+            if dias_logon is None or dias_logon > self.DIAS_INACTIVIDAD:
+                ev["servicio_sin_uso" if servicio else "inactivas"].append(nombre)
+            if dias_clave is None or dias_clave > self.DIAS_CLAVE:
+                ev["claves_antiguas"].append(nombre)
+        ev["administradores"].extend(tabla["admin_externos"])
+        return ev
+    
+    @staticmethod
+    def _como_lista(valor):
+        # ConvertTo-Json devuelve un objeto suelto cuando la colección tiene un solo elemento
+        if valor is None:
+            return []
+        return valor if isinstance(valor, list) else [valor]
+    
+    @staticmethod
+    def _dias_desde(fecha, ahora):
+        if not fecha:
+            return None
+        try:
+            return (ahora - datetime.strptime(fecha[:19], "%Y-%m-%dT%H:%M:%S")).days
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _listar(nombres, maximo=10):
+        texto = ", ".join(nombres[:maximo])
+        if len(nombres) > maximo:
+            texto += f" (+{len(nombres) - maximo} más)"
+        return texto
 
 
 # ============================================================================
@@ -524,6 +937,9 @@ class VerificadorUsuarios(VerificadorBase):
 # ============================================================================
 
 class VerificadorEncriptacion(VerificadorBase):
+    CMD_DISCOS = "wmic logicaldisk get name, filesystem"
+    comandos = (CMD_DISCOS,)
+
     def verificar(self):
         resultado = {
             "componente": "Encriptación",
@@ -546,6 +962,7 @@ class VerificadorEncriptacion(VerificadorBase):
                 resultado["controles"][1]["valor"] = "No (FAT/FAT32)"
                 resultado["hallazgos"].append({
                     "titulo": "Sistema de archivos no seguro",
+                    "control": "Sistema de archivos NTFS",
                     "descripcion": "Se detectó FAT o FAT32",
                     "severidad": "MEDIO",
                     "norma_iso": "ISO/IEC 27001 A.10.2.1",
@@ -560,7 +977,7 @@ class VerificadorEncriptacion(VerificadorBase):
         return resultado
     
     def _verificar_ntfs(self):
-        output = self._ejecutar_cmd("wmic logicaldisk get name, filesystem")
+        output = self._ejecutar_cmd(self.CMD_DISCOS)
         return {
             "tiene_fat": "FAT" in output,
             "tiene_fat32": "FAT32" in output,
@@ -568,12 +985,24 @@ class VerificadorEncriptacion(VerificadorBase):
         }
 
 
+VERIFICADORES = {
+    "Políticas de Contraseñas": VerificadorContraseñas,
+    "Actualizaciones y Parches": VerificadorActualizaciones,
+    "Firewall": VerificadorFirewall,
+    "Antimalware": VerificadorAntimalware,
+    "Auditoría y Registros": VerificadorAuditoria,
+    "Usuarios y Cuentas": VerificadorUsuarios,
+    "Encriptación": VerificadorEncriptacion
+}
+
+
 # ============================================================================
 # GENERADOR DE REPORTES DETALLADO
 # ============================================================================
 
 class GeneradorReportes:
-    def __init__(self):
+    def __init__(self, directorio=None):
+        self.directorio = directorio
         self.timestamp = datetime.now()
         self.hallazgos = []
         self.verificaciones = {}
@@ -626,29 +1055,162 @@ class GeneradorReportes:
         
         return self.puntuacion_general
     
+    def construir_modelo(self, salidas=None, host=None):
+        import platform
+        verificaciones = tuple(Verificacion.desde_dict(nombre, v) for nombre, v in self.verificaciones.items())
+        return ModeloResultados(
+            host=host or platform.node() or "localhost",
+            fecha=self.timestamp,
+            puntuacion_general=self.puntuacion_general,
+            controles_cumplidos=self.controles_cumplidos,
+            total_controles=self.total_controles,
+            puntuaciones_iso=tuple(
+                PuntuacionISO(iso, d["cumplidos"], d["total"], d["porcentaje"])
+                for iso, d in self.puntuaciones_iso.items()
+            ),
+            verificaciones=verificaciones,
+            hallazgos=tuple(h for v in verificaciones for h in v.hallazgos),
+            salidas=MappingProxyType(dict(salidas or {}))
+        )
+    
+    def emitir(self, formatos, salidas=None, host=None):
+        return emitir_reportes(self.construir_modelo(salidas, host), formatos, self.directorio)
+    
     def generar_json(self):
-        contenido = {
-            "fecha": self.timestamp.isoformat(),
+        return self.emitir(["json"])["json"]
+    
+    def generar_html(self):
+        return self.emitir(["html"])["html"]
+    
+    def generar_binario(self, salidas=None, host=None):
+        return self.emitir(["binario"], salidas, host)["binario"]
+
+
+# ============================================================================
+# MODELO DE RESULTADOS Y EMISORES DE REPORTES
+# ============================================================================
+#
+# GeneradorReportes.construir_modelo() congela los resultados en tuplas; cada
+# emisor solo lee ese modelo y devuelve los bytes de su formato. Para añadir un
+# formato basta con una subclase de Emisor registrada en EMISORES.
+
+class Control(namedtuple("Control", "nombre cumple valor")):
+    __slots__ = ()
+    
+    def a_dict(self):
+        return {"nombre": self.nombre, "cumple": self.cumple, "valor": self.valor}
+
+
+class Hallazgo(namedtuple("Hallazgo", "titulo control descripcion severidad norma_iso recomendacion")):
+    __slots__ = ()
+    
+    @classmethod
+    def desde_dict(cls, h):
+        return cls(h.get("titulo", ""), h.get("control"), h.get("descripcion", ""),
+                   h.get("severidad", ""), h.get("norma_iso", ""), h.get("recomendacion", ""))
+    
+    def a_dict(self):
+        d = {"titulo": self.titulo}
+        if self.control is not None:
+            d["control"] = self.control
+        d["descripcion"] = self.descripcion
+        d["severidad"] = self.severidad
+        d["norma_iso"] = self.norma_iso
+        d["recomendacion"] = self.recomendacion
+        return d
+
+
+class Verificacion(namedtuple("Verificacion", "nombre componente estado norma_referencia controles hallazgos error")):
+    __slots__ = ()
+    
+    @classmethod
+    def desde_dict(cls, nombre, v):
+        return cls(
+            nombre, v.get("componente", nombre), v.get("estado", "DESCONOCIDO"), v.get("norma_referencia", ""),
+            tuple(Control(c["nombre"], c["cumple"], c["valor"]) for c in v.get("controles", [])),
+            tuple(Hallazgo.desde_dict(h) for h in v.get("hallazgos", [])),
+            v.get("error")
+        )
+    
+    def a_dict(self):
+        d = {
+            "componente": self.componente,
+            "estado": self.estado,
+            "hallazgos": [h.a_dict() for h in self.hallazgos],
+            "norma_referencia": self.norma_referencia,
+            "controles": [c.a_dict() for c in self.controles]
+        }
+        if self.error is not None:
+            d["error"] = self.error
+        return d
+    
+    def hallazgos_por_control(self):
+        por_control = {}
+        for h in self.hallazgos:
+            por_control.setdefault(h.control, []).append(h)
+        return por_control
+
+
+PuntuacionISO = namedtuple("PuntuacionISO", "norma cumplidos total porcentaje")
+
+
+class ModeloResultados(namedtuple("ModeloResultados", "host fecha puntuacion_general controles_cumplidos "
+                                                      "total_controles puntuaciones_iso verificaciones hallazgos salidas")):
+    __slots__ = ()
+    
+    def contenido(self):
+        """Misma forma que el reporte JSON."""
+        return {
+            "fecha": self.fecha.isoformat(),
             "puntuacion_general": self.puntuacion_general,
             "controles_cumplidos": f"{self.controles_cumplidos}/{self.total_controles}",
-            "puntuaciones_iso": self.puntuaciones_iso,
+            "puntuaciones_iso": {
+                p.norma: {"cumplidos": p.cumplidos, "total": p.total, "porcentaje": p.porcentaje}
+                for p in self.puntuaciones_iso
+            },
             "total_hallazgos": len(self.hallazgos),
-            "verificaciones": self.verificaciones,
-            "hallazgos": self.hallazgos
+            "verificaciones": {v.nombre: v.a_dict() for v in self.verificaciones},
+            "hallazgos": [h.a_dict() for h in self.hallazgos]
         }
-        with open("reporte_seguridad.json", "w", encoding="utf-8") as f:
-            json.dump(contenido, f, ensure_ascii=False, indent=2)
-        return "reporte_seguridad.json"
+
+
+def _identificador(texto):
+    ascii_ = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "-", ascii_.lower()).strip("-")
+
+
+class Emisor(ABC):
+    formato = None
+    archivo = None
     
-    def generar_html(self):
+    @abstractmethod
+    def renderizar(self, modelo):
+        """Devuelve el contenido del reporte en bytes."""
+
+
+class EmisorJSON(Emisor):
+    formato = "json"
+    archivo = "reporte_seguridad.json"
+    
+    def renderizar(self, modelo):
+        return json.dumps(modelo.contenido(), ensure_ascii=False, indent=2).encode("utf-8")
+
+
+class EmisorHTML(Emisor):
+    formato = "html"
+    archivo = "reporte_seguridad.html"
+    
+    def renderizar(self, modelo):
+        # Los textos del modelo incluyen datos del equipo (nombres de cuentas): siempre escapados
         colores = {
             "CRÍTICO": "#dc3545", "ALTO": "#fd7e14", "MEDIO": "#ffc107",
             "BAJO": "#28a745", "INFORMACIÓN": "#17a2b8"
         }
         
         iso_html = ""
-        for iso, datos in sorted(self.puntuaciones_iso.items()):
-            porcentaje = datos["porcentaje"]
+        for datos in sorted(modelo.puntuaciones_iso):
+            iso = escape(datos.norma)
+            porcentaje = datos.porcentaje
             color = "#28a745" if porcentaje >= 75 else "#ffc107" if porcentaje >= 60 else "#dc3545"
             iso_html += f"""
             <div style="background: white; padding: 15px; margin: 10px 0; border-radius: 8px; border-left: 4px solid {color};">
@@ -660,36 +1222,36 @@ class GeneradorReportes:
                         </div>
                     </div>
                     <span style="margin-left: 15px; font-weight: bold; color: {color}; min-width: 80px; text-align: right;">
-                        {porcentaje}% ({datos['cumplidos']}/{datos['total']})
+                        {porcentaje}% ({datos.cumplidos}/{datos.total})
                     </span>
                 </div>
             </div>
             """
         
         controles_html = ""
-        for nombre, v in sorted(self.verificaciones.items()):
-            if "controles" in v:
-                controles_html += f"<h4>{nombre}</h4>"
-                for control in v["controles"]:
-                    estado = "✓" if control["cumple"] else "✗"
-                    color = "#28a745" if control["cumple"] else "#dc3545"
+        for v in sorted(modelo.verificaciones, key=lambda v: v.nombre):
+            if v.controles:
+                controles_html += f"<h4>{escape(v.nombre)}</h4>"
+                for control in v.controles:
+                    estado = "✓" if control.cumple else "✗"
+                    color = "#28a745" if control.cumple else "#dc3545"
                     controles_html += f"""
                     <div style="margin: 8px 0; padding: 8px; background: #f9f9f9; border-left: 3px solid {color};">
-                        <span style="color: {color}; font-weight: bold;">{estado}</span> {control['nombre']}
-                        <span style="float: right; color: #666;">({control['valor']})</span>
+                        <span style="color: {color}; font-weight: bold;">{estado}</span> {escape(control.nombre)}
+                        <span style="float: right; color: #666;">({escape(str(control.valor))})</span>
                     </div>
                     """
         
         hallazgos_html = ""
-        for h in self.hallazgos:
-            color = colores.get(h["severidad"], "#999")
+        for h in modelo.hallazgos:
+            color = colores.get(h.severidad, "#999")
             hallazgos_html += f"""
             <div style="border-left: 5px solid {color}; padding: 15px; margin: 10px 0; background: #f9f9f9; border-radius: 4px;">
-                <h4 style="color: {color}; margin: 0 0 10px 0;">{h['titulo']}</h4>
-                <p><strong>Severidad:</strong> <span style="color: {color}; font-weight: bold;">{h['severidad']}</span></p>
-                <p><strong>Descripción:</strong> {h['descripcion']}</p>
-                <p><strong>Norma:</strong> {h['norma_iso']}</p>
-                <p><strong>Recomendación:</strong> <code style="background: #f0f0f0; padding: 5px;">{h['recomendacion']}</code></p>
+                <h4 style="color: {color}; margin: 0 0 10px 0;">{escape(h.titulo)}</h4>
+                <p><strong>Severidad:</strong> <span style="color: {color}; font-weight: bold;">{escape(h.severidad)}</span></p>
+                <p><strong>Descripción:</strong> {escape(h.descripcion)}</p>
+                <p><strong>Norma:</strong> {escape(h.norma_iso)}</p>
+                <p><strong>Recomendación:</strong> <code style="background: #f0f0f0; padding: 5px;">{escape(h.recomendacion)}</code></p>
             </div>
             """
         
@@ -713,16 +1275,16 @@ class GeneradorReportes:
 <body>
     <div class="container">
         <h1>🔒 Reporte Detallado de Verificación de Seguridad Windows</h1>
-        <p><strong>Fecha:</strong> {self.timestamp.strftime('%d/%m/%Y %H:%M:%S')}</p>
+        <p><strong>Fecha:</strong> {modelo.fecha.strftime('%d/%m/%Y %H:%M:%S')}</p>
         <p><strong>Normas:</strong> ISO/IEC 27001:2022, 27002:2022</p>
         
         <div class="resumen">
-            <div class="tarjeta puntuacion">{self.puntuacion_general}%<br><small>Puntuación General</small></div>
+            <div class="tarjeta puntuacion">{modelo.puntuacion_general}%<br><small>Puntuación General</small></div>
             <div class="tarjeta" style="background: linear-gradient(135deg, #667eea, #764ba2);">
-                {self.controles_cumplidos}/{self.total_controles}<br><small>Controles Cumplidos</small>
+                {modelo.controles_cumplidos}/{modelo.total_controles}<br><small>Controles Cumplidos</small>
             </div>
             <div class="tarjeta" style="background: linear-gradient(135deg, #667eea, #764ba2);">
-                {len(self.hallazgos)}<br><small>Hallazgos</small>
+                {len(modelo.hallazgos)}<br><small>Hallazgos</small>
             </div>
         </div>
         
@@ -738,81 +1300,1023 @@ class GeneradorReportes:
         
         <div class="seccion">
             <h2>⚠️ Hallazgos Detallados</h2>
-            {hallazgos_html if self.hallazgos else "<p>✓ No se encontraron hallazgos críticos.</p>"}
+            {hallazgos_html if modelo.hallazgos else "<p>✓ No se encontraron hallazgos críticos.</p>"}
         </div>
     </div>
 </body>
 </html>"""
+        return html.encode("utf-8")
+
+
+class EmisorBinario(Emisor):
+    formato = "binario"
+    archivo = "reporte_seguridad.veri"
+    
+    def renderizar(self, modelo):
+        buf = io.BytesIO()
+        with EscritorBinario(buf) as escritor:
+            escritor.agregar_host(modelo.host, modelo.contenido(), dict(modelo.salidas))
+        return buf.getvalue()
+
+
+class EmisorSARIF(Emisor):
+    formato = "sarif"
+    archivo = "reporte_seguridad.sarif"
+    
+    NIVELES = {"CRITICO": "error", "CRÍTICO": "error", "ALTO": "error", "MEDIO": "warning",
+               "BAJO": "note", "INFORMACIÓN": "note"}
+    
+    def renderizar(self, modelo):
+        reglas = []
+        resultados = []
+        notificaciones = []
+        for v in modelo.verificaciones:
+            base = _identificador(v.nombre)
+            for c in v.controles:
+                reglas.append({
+                    "id": f"{base}/{_identificador(c.nombre)}",
+                    "name": c.nombre,
+                    "shortDescription": {"text": c.nombre},
+                    "properties": {"componente": v.componente, "norma": v.norma_referencia}
+                })
+            for h in v.hallazgos:
+                resultados.append({
+                    "ruleId": f"{base}/{_identificador(h.control or h.titulo)}",
+                    "level": self.NIVELES.get(h.severidad, "warning"),
+                    "message": {"text": f"{h.titulo}: {h.descripcion}"},
+                    "locations": [{"logicalLocations": [{
+                        "name": v.componente,
+                        "fullyQualifiedName": f"{modelo.host}/{v.componente}",
+                        "kind": "module"
+                    }]}],
+                    "properties": {"severidad": h.severidad, "norma_iso": h.norma_iso,
+                                   "recomendacion": h.recomendacion}
+                })
+            if v.error is not None:
+                notificaciones.append({"level": "error", "message": {"text": f"{v.nombre}: {v.error}"}})
+        
+        sarif = {
+            "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+            "version": "2.1.0",
+            "runs": [{
+                "tool": {"driver": {
+                    "name": "veri",
+                    "fullName": "Verificador de Seguridad Windows - ISO 27001/27002",
+                    "version": VERSION,
+                    "rules": reglas
+                }},
+                "invocations": [{
+                    "executionSuccessful": not notificaciones,
+                    "toolExecutionNotifications": notificaciones
+                }],
+                "results": resultados,
+                "properties": {
+                    "host": modelo.host,
+                    "fecha": modelo.fecha.isoformat(),
+                    "puntuacion_general": modelo.puntuacion_general
+                }
+            }]
+        }
+        return json.dumps(sarif, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+class EmisorJUnit(Emisor):
+    formato = "junit"
+    archivo = "reporte_seguridad.junit.xml"
+    
+    def renderizar(self, modelo):
+        import xml.etree.ElementTree as ET
+        fecha = modelo.fecha.isoformat(timespec="seconds")
+        raiz = ET.Element("testsuites", name="veri")
+        total = fallos = errores = 0
+        for v in modelo.verificaciones:
+            por_control = v.hallazgos_por_control()
+            suite = ET.SubElement(raiz, "testsuite", name=v.nombre, hostname=modelo.host, timestamp=fecha)
+            s_fallos = s_errores = 0
+            for c in v.controles:
+                caso = ET.SubElement(suite, "testcase", classname=v.componente, name=c.nombre)
+                if v.error is not None:
+                    s_errores += 1
+                    ET.SubElement(caso, "error", message=v.error)
+                elif not c.cumple:
+                    s_fallos += 1
+                    hallazgos = por_control.get(c.nombre, [])
+                    mensaje = hallazgos[0].titulo if hallazgos else f"No cumple ({c.valor})"
+                    fallo = ET.SubElement(caso, "failure", message=mensaje,
+                                          type=hallazgos[0].severidad if hallazgos else "NO_CUMPLE")
+                    fallo.text = "\n".join(
+                        f"{h.descripcion}\nNorma: {h.norma_iso}\nRecomendación: {h.recomendacion}" for h in hallazgos
+                    ) or f"Valor: {c.valor}"
+            suite.set("tests", str(len(v.controles)))
+            suite.set("failures", str(s_fallos))
+            suite.set("errors", str(s_errores))
+            total += len(v.controles)
+            fallos += s_fallos
+            errores += s_errores
+        raiz.set("tests", str(total))
+        raiz.set("failures", str(fallos))
+        raiz.set("errors", str(errores))
+        return b'<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(raiz, encoding="unicode").encode("utf-8")
+
+
+class EmisorCSV(Emisor):
+    formato = "csv"
+    archivo = "reporte_seguridad.csv"
+    
+    COLUMNAS = ("host", "fecha", "verificacion", "norma", "control", "cumple", "valor",
+                "severidad", "hallazgo", "recomendacion")
+    
+    def renderizar(self, modelo):
+        import csv
+        buf = io.StringIO()
+        escritor = csv.writer(buf)
+        escritor.writerow(self.COLUMNAS)
+        fecha = modelo.fecha.isoformat(timespec="seconds")
+        for v in modelo.verificaciones:
+            por_control = v.hallazgos_por_control()
+            for c in v.controles:
+                hallazgos = por_control.get(c.nombre, [])
+                escritor.writerow([
+                    modelo.host, fecha, v.nombre, v.norma_referencia, c.nombre,
+                    "Sí" if c.cumple else "No", c.valor,
+                    " | ".join(h.severidad for h in hallazgos),
+                    " | ".join(h.titulo for h in hallazgos),
+                    " | ".join(h.recomendacion for h in hallazgos)
+                ])
+            for h in por_control.get(None, []):
+                escritor.writerow([modelo.host, fecha, v.nombre, v.norma_referencia, "", "", "",
+                                   h.severidad, h.titulo, h.recomendacion])
+        # BOM para que Excel detecte UTF-8
+        return buf.getvalue().encode("utf-8-sig")
+
+
+EMISORES = {
+    emisor.formato: emisor
+    for emisor in (EmisorJSON, EmisorHTML, EmisorBinario, EmisorSARIF, EmisorJUnit, EmisorCSV)
+}
+
+
+def _escribir_atomico(ruta, datos):
+    import tempfile
+    fd, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta) or ".", prefix=".veri-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(datos)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temporal, 0o644)
+        os.replace(temporal, ruta)
+    except BaseException:
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+        raise
+
+
+def emitir_reportes(modelo, formatos, directorio=None):
+    """Renderiza en paralelo cada formato desde el mismo modelo. Devuelve {formato: ruta}."""
+    desconocidos = [f for f in formatos if f not in EMISORES]
+    if desconocidos:
+        raise ValueError(f"Formato desconocido: {', '.join(desconocidos)}")
+    directorio = directorio or ""
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    
+    def emitir(formato):
+        emisor = EMISORES[formato]()
+        ruta = os.path.join(directorio, emisor.archivo)
+        _escribir_atomico(ruta, emisor.renderizar(modelo))
+        return ruta
+    
+    if len(formatos) <= 1:
+        return {f: emitir(f) for f in formatos}
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=len(formatos)) as pool:
+        return dict(zip(formatos, pool.map(emitir, formatos)))
+
+
+# ============================================================================
+# FORMATO BINARIO COMPACTO (.veri)
+# ============================================================================
+#
+#   cabecera   b"VERI" + u16 versión + u16 reservado
+#   registros  [u32 longitud][zlib(valor codificado)] ...
+#   índices    un registro por grupo: lista de [resto de clave, desplazamiento, longitud]
+#   cortas     u32 n + u32 desplazamientos[n + 1] + UTF-8        (sin comprimir)
+#   largas     u32 n + u32 bloques + (u32 bloque, u32 inicio, u32 fin)[n]
+#              + u64 desplazamiento[bloques] ; cada bloque es [u32 longitud][zlib(UTF-8)]
+#   grupos     u32 n + (u32 tipo, u32 nombre, u64 índice)[n] + u32 orden[n]
+#   pie        u64 cortas + u64 largas + u64 grupos + b"VERI"
+#
+# Las cadenas se internan una sola vez. Las cortas (claves, nombres, estados)
+# van sin comprimir para resolverlas directamente sobre el mmap; las largas
+# (salidas, descripciones) se agrupan en bloques comprimidos que solo se
+# descomprimen al leer una cadena que contienen.
+#
+# Las claves se agrupan por sus dos primeros elementos. La tabla de grupos es
+# de ancho fijo y 'orden' la recorre ordenada por (tipo, nombre), así que
+# localizar un host es una búsqueda binaria y solo se decodifica su índice.
+#
+# Registros por host:
+#   ("host", <host>, "resumen")                  contenido sin verificaciones ni hallazgos
+#   ("host", <host>, "verificacion", <nombre>)   resultado de un verificador
+#   ("host", <host>, "salidas")                  {comando: salida en bruto}
+
+MAGIA_BINARIO = b"VERI"
+VERSION_BINARIO = 2
+
+LIMITE_CADENA_CORTA = 64
+TAMANO_BLOQUE = 256 * 1024
+
+_T_NULO, _T_FALSO, _T_CIERTO, _T_ENTERO, _T_REAL, _T_CADENA, _T_LISTA, _T_DICT, _T_LARGA = range(9)
+
+
+def _escribir_varint(buf, n):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _leer_varint(datos, pos):
+    n = desplazamiento = 0
+    while True:
+        b = datos[pos]
+        pos += 1
+        n |= (b & 0x7F) << desplazamiento
+        if b < 0x80:
+            return n, pos
+        desplazamiento += 7
+
+
+class EscritorBinario:
+    def __init__(self, ruta, nivel=6):
+        self.ruta = ruta
+        self.nivel = nivel
+        self.cortas = {}
+        self.largas = {}
+        self.grupos = {}
+        self.propio = not hasattr(ruta, "write")
+        self.f = open(ruta, "wb") if self.propio else ruta
+        self.f.write(MAGIA_BINARIO + struct.pack("<HH", VERSION_BINARIO, 0))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.cerrar()
+    
+    def _corta(self, texto):
+        indice = self.cortas.get(texto)
+        if indice is None:
+            indice = self.cortas[texto] = len(self.cortas)
+        return indice
+    
+    def _cadena(self, texto, buf):
+        if len(texto) <= LIMITE_CADENA_CORTA and len(texto.encode("utf-8")) <= LIMITE_CADENA_CORTA:
+            buf.append(_T_CADENA)
+            _escribir_varint(buf, self._corta(texto))
+        else:
+            indice = self.largas.get(texto)
+            if indice is None:
+                indice = self.largas[texto] = len(self.largas)
+            buf.append(_T_LARGA)
+            _escribir_varint(buf, indice)
+    
+    def _codificar(self, valor, buf):
+        if valor is None:
+            buf.append(_T_NULO)
+        elif valor is True or valor is False:
+            buf.append(_T_CIERTO if valor else _T_FALSO)
+        elif isinstance(valor, int):
+            buf.append(_T_ENTERO)
+            _escribir_varint(buf, valor << 1 if valor >= 0 else (-valor << 1) - 1)
+        elif isinstance(valor, float):
+            buf.append(_T_REAL)
+            buf += struct.pack("<d", valor)
+        elif isinstance(valor, str):
+            self._cadena(valor, buf)
+        elif isinstance(valor, (list, tuple)):
+            buf.append(_T_LISTA)
+            _escribir_varint(buf, len(valor))
+            for v in valor:
+                self._codificar(v, buf)
+        elif isinstance(valor, dict):
+            buf.append(_T_DICT)
+            _escribir_varint(buf, len(valor))
+            for k, v in valor.items():
+                self._cadena(str(k), buf)
+                self._codificar(v, buf)
+        else:
+            raise TypeError(f"Tipo no soportado en formato binario: {type(valor).__name__}")
+    
+    def _escribir_bloque(self, datos):
+        datos = zlib.compress(datos, self.nivel)
+        desplazamiento = self.f.tell()
+        self.f.write(struct.pack("<I", len(datos)))
+        self.f.write(datos)
+        return desplazamiento, len(datos)
+    
+    def _escribir_registro(self, valor):
+        buf = bytearray()
+        self._codificar(valor, buf)
+        return self._escribir_bloque(bytes(buf))
+    
+    def agregar(self, clave, valor):
+        if len(clave) < 2:
+            raise ValueError(f"Clave demasiado corta: {clave!r}")
+        desplazamiento, longitud = self._escribir_registro(valor)
+        grupo = (str(clave[0]), str(clave[1]))
+        self.grupos.setdefault(grupo, []).append([list(clave[2:]), desplazamiento, longitud])
+    
+    def agregar_host(self, host, reporte, salidas=None):
+        resumen = {k: v for k, v in reporte.items() if k not in ("verificaciones", "hallazgos")}
+        self.agregar(("host", host, "resumen"), resumen)
+        for nombre, verificacion in reporte.get("verificaciones", {}).items():
+            self.agregar(("host", host, "verificacion", nombre), verificacion)
+        if salidas is not None:
+            self.agregar(("host", host, "salidas"), salidas)
+    
+    def _escribir_largas(self):
+        entradas = []
+        bloques = []
+        actual = bytearray()
+        for texto in self.largas:
+            if len(actual) >= TAMANO_BLOQUE:
+                bloques.append(self._escribir_bloque(bytes(actual))[0])
+                actual = bytearray()
+            datos = texto.encode("utf-8")
+            entradas.append((len(bloques), len(actual), len(actual) + len(datos)))
+            actual += datos
+        if actual:
+            bloques.append(self._escribir_bloque(bytes(actual))[0])
+        
+        off_largas = self.f.tell()
+        self.f.write(struct.pack("<II", len(entradas), len(bloques)))
+        self.f.write(b"".join(struct.pack("<III", *e) for e in entradas))
+        self.f.write(struct.pack(f"<{len(bloques)}Q", *bloques))
+        return off_largas
+    
+    def _escribir_cortas(self):
+        off_cortas = self.f.tell()
+        codificadas = [c.encode("utf-8") for c in self.cortas]
+        posiciones = [0]
+        for c in codificadas:
+            posiciones.append(posiciones[-1] + len(c))
+        self.f.write(struct.pack("<I", len(codificadas)))
+        self.f.write(struct.pack(f"<{len(posiciones)}I", *posiciones))
+        self.f.write(b"".join(codificadas))
+        return off_cortas
+    
+    def cerrar(self):
+        if self.f is None:
+            return
+        # Los índices y los nombres de grupo se internan antes de escribir las tablas.
+        # Los nombres van siempre a la tabla corta: la búsqueda binaria los lee del mmap.
+        claves = list(self.grupos)
+        grupos = [(self._corta(tipo), self._corta(nombre), self._escribir_registro(self.grupos[(tipo, nombre)])[0])
+                  for tipo, nombre in claves]
+        orden = sorted(range(len(claves)), key=claves.__getitem__)
+        
+        off_largas = self._escribir_largas()
+        off_cortas = self._escribir_cortas()
+        off_grupos = self.f.tell()
+        self.f.write(struct.pack("<I", len(grupos)))
+        self.f.write(b"".join(struct.pack("<IIQ", *g) for g in grupos))
+        self.f.write(struct.pack(f"<{len(orden)}I", *orden))
+        self.f.write(struct.pack("<QQQ", off_cortas, off_largas, off_grupos) + MAGIA_BINARIO)
+        if self.propio:
+            self.f.close()
+        self.f = None
+
+
+class LectorBinario:
+    """
+    Lee un contenedor .veri mediante mmap. Al abrir solo se leen las cabeceras
+    de las tablas; el índice de un host se decodifica al consultarlo y cada
+    bloque de cadenas largas se descomprime cuando se necesita.
+    """
+    
+    def __init__(self, ruta):
+        self.f = open(ruta, "rb")
+        self.mm = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.vista = memoryview(self.mm)
+        if self.vista[:4] != MAGIA_BINARIO or self.vista[-4:] != MAGIA_BINARIO:
+            self.cerrar()
+            raise ValueError(f"{ruta} no es un contenedor .veri")
+        version, = struct.unpack_from("<H", self.mm, 4)
+        if version != VERSION_BINARIO:
+            self.cerrar()
+            raise ValueError(f"Versión de formato no soportada: {version}")
+        
+        self.off_cortas, self.off_largas, self.off_grupos = struct.unpack_from("<QQQ", self.mm, len(self.mm) - 28)
+        num_cortas, = struct.unpack_from("<I", self.mm, self.off_cortas)
+        self.base_cortas = self.off_cortas + 4 + 4 * (num_cortas + 1)
+        num_largas, num_bloques = struct.unpack_from("<II", self.mm, self.off_largas)
+        self.base_bloques = self.off_largas + 8 + 12 * num_largas
+        self.num_grupos, = struct.unpack_from("<I", self.mm, self.off_grupos)
+        self.base_orden = self.off_grupos + 4 + 16 * self.num_grupos
+        
+        self._cache_cadenas = {}
+        self._cache_largas = {}
+        self._bloque = (None, b"")
+        self._indices = {}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.cerrar()
+    
+    def cerrar(self):
+        if self.vista is not None:
+            self.vista.release()
+            self.vista = None
+            self.mm.close()
+            self.f.close()
+    
+    def _cadena(self, i):
+        texto = self._cache_cadenas.get(i)
+        if texto is None:
+            inicio, fin = struct.unpack_from("<II", self.mm, self.off_cortas + 4 + 4 * i)
+            texto = str(self.vista[self.base_cortas + inicio:self.base_cortas + fin], "utf-8")
+            self._cache_cadenas[i] = texto
+        return texto
+    
+    def _larga(self, i):
+        texto = self._cache_largas.get(i)
+        if texto is None:
+            bloque, inicio, fin = struct.unpack_from("<III", self.mm, self.off_largas + 8 + 12 * i)
+            if self._bloque[0] != bloque:
+                desplazamiento, = struct.unpack_from("<Q", self.mm, self.base_bloques + 8 * bloque)
+                self._bloque = (bloque, self._descomprimir(desplazamiento))
+            texto = self._bloque[1][inicio:fin].decode("utf-8")
+            self._cache_largas[i] = texto
+        return texto
+    
+    def _decodificar(self, datos, pos):
+        tipo = datos[pos]
+        pos += 1
+        if tipo == _T_NULO:
+            return None, pos
+        if tipo == _T_FALSO:
+            return False, pos
+        if tipo == _T_CIERTO:
+            return True, pos
+        if tipo == _T_ENTERO:
+            n, pos = _leer_varint(datos, pos)
+            return (n >> 1) ^ -(n & 1), pos
+        if tipo == _T_REAL:
+            return struct.unpack_from("<d", datos, pos)[0], pos + 8
+        if tipo == _T_CADENA:
+            i, pos = _leer_varint(datos, pos)
+            return self._cadena(i), pos
+        if tipo == _T_LARGA:
+            i, pos = _leer_varint(datos, pos)
+            return self._larga(i), pos
+        if tipo == _T_LISTA:
+            n, pos = _leer_varint(datos, pos)
+            lista = []
+            for _ in range(n):
+                v, pos = self._decodificar(datos, pos)
+                lista.append(v)
+            return lista, pos
+        if tipo == _T_DICT:
+            n, pos = _leer_varint(datos, pos)
+            d = {}
+            for _ in range(n):
+                k, pos = self._decodificar(datos, pos)
+                d[k], pos = self._decodificar(datos, pos)
+            return d, pos
+        raise ValueError(f"Marca de tipo desconocida: {tipo}")
+    
+    def _descomprimir(self, desplazamiento):
+        longitud, = struct.unpack_from("<I", self.mm, desplazamiento)
+        return zlib.decompress(self.vista[desplazamiento + 4:desplazamiento + 4 + longitud])
+    
+    def _leer_registro(self, desplazamiento):
+        return self._decodificar(self._descomprimir(desplazamiento), 0)[0]
+    
+    def _grupo_en(self, posicion):
+        tipo, nombre, desplazamiento = struct.unpack_from("<IIQ", self.mm, self.off_grupos + 4 + 16 * posicion)
+        return self._cadena(tipo), self._cadena(nombre), desplazamiento
+    
+    def _indice(self, tipo, nombre):
+        """Índice {resto de clave: (desplazamiento, longitud)} del grupo, o None si no existe."""
+        grupo = (tipo, nombre)
+        if grupo in self._indices:
+            return self._indices[grupo]
+        bajo, alto = 0, self.num_grupos
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            posicion, = struct.unpack_from("<I", self.mm, self.base_orden + 4 * medio)
+            if self._grupo_en(posicion)[:2] < grupo:
+                bajo = medio + 1
+            else:
+                alto = medio
+        indice = None
+        if bajo < self.num_grupos:
+            posicion, = struct.unpack_from("<I", self.mm, self.base_orden + 4 * bajo)
+            t, n, desplazamiento = self._grupo_en(posicion)
+            if (t, n) == grupo:
+                indice = {tuple(resto): (d, l) for resto, d, l in self._leer_registro(desplazamiento)}
+        self._indices[grupo] = indice
+        return indice
+    
+    def leer(self, clave):
+        indice = self._indice(clave[0], clave[1]) or {}
+        desplazamiento, _ = indice[tuple(clave[2:])]
+        return self._leer_registro(desplazamiento)
+    
+    def hosts(self):
+        grupos = (self._grupo_en(i) for i in range(self.num_grupos))
+        return [nombre for tipo, nombre, _ in grupos if tipo == "host"]
+    
+    def verificaciones(self, host):
+        return [c[1] for c in self._indice("host", host) or () if c[0] == "verificacion"]
+    
+    def verificacion(self, host, nombre):
+        return self.leer(("host", host, "verificacion", nombre))
+    
+    def control(self, host, componente, nombre_control):
+        for control in self.verificacion(host, componente).get("controles", []):
+            if control["nombre"] == nombre_control:
+                return control
+        raise KeyError(nombre_control)
+    
+    def salidas(self, host):
+        indice = self._indice("host", host) or {}
+        return self.leer(("host", host, "salidas")) if ("salidas",) in indice else {}
+
+    def reporte(self, host):
+        """Reconstruye el contenido con la forma de generar_json."""
+        contenido = self.leer(("host", host, "resumen"))
+        verificaciones = {nombre: self.verificacion(host, nombre) for nombre in self.verificaciones(host)}
+        hallazgos = [h for v in verificaciones.values() for h in v.get("hallazgos", [])]
+        
+        reporte = {}
+        for campo in ("fecha", "puntuacion_general", "controles_cumplidos", "puntuaciones_iso", "total_hallazgos"):
+            if campo in contenido:
+                reporte[campo] = contenido.pop(campo)
+        reporte["verificaciones"] = verificaciones
+        reporte["hallazgos"] = hallazgos
+        reporte.update(contenido)
+        return reporte
+
+
+def escribir_binario(ruta, hosts):
+    """hosts: {host: {"reporte": contenido de generar_json, "salidas": {comando: salida}}}"""
+    with EscritorBinario(ruta) as escritor:
+        for host, datos in hosts.items():
+            escritor.agregar_host(host, datos["reporte"], datos.get("salidas"))
+    return ruta
+
+
+def json_a_binario(ruta_json, ruta_binario, host=None):
+    import platform
+    with open(ruta_json, encoding="utf-8") as f:
+        reporte = json.load(f)
+    host = host or platform.node() or "localhost"
+    return escribir_binario(ruta_binario, {host: {"reporte": reporte}})
+
+
+def binario_a_json(ruta_binario, ruta_json=None, host=None):
+    with LectorBinario(ruta_binario) as lector:
+        if host is None:
+            hosts = lector.hosts()
+            if len(hosts) != 1:
+                raise ValueError(f"El contenedor tiene {len(hosts)} hosts; indicar uno")
+            host = hosts[0]
+        reporte = lector.reporte(host)
+    if ruta_json:
+        with open(ruta_json, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+    return reporte
+
+
+# ============================================================================
+# EVALUACIÓN DE FLOTA CON DEDUPLICACIÓN POR HUELLA DE CONFIGURACIÓN
+# ============================================================================
+
+# Campos que cambian entre hosts clonados de la misma imagen sin afectar a la
+# evaluación. El nombre del host y el SID de máquina se sustituyen aparte por
+# marcadores; los verificadores evalúan la salida normalizada y en el
+# resultado de cada host los marcadores vuelven a ser sus propios valores.
+PATRONES_VOLATILES = (
+    (re.compile(r"[ \t]+$", re.MULTILINE), ""),
+)
+
+# SID de máquina: prefijo de la cuenta integrada Administrator (RID 500)
+_PATRON_SID_MAQUINA = re.compile(r"\b(S-1-5-21-\d+-\d+-\d+)-500\b")
+
+
+def sid_maquina(salidas):
+    for salida in salidas.values():
+        m = _PATRON_SID_MAQUINA.search(salida)
+        if m:
+            return m.group(1)
+    return None
+
+
+MARCADOR_HOST = "<HOST>"
+MARCADOR_SID = "S-1-5-21-<MAQUINA>"
+
+
+def _patron_literal(texto):
+    # Distingue mayúsculas: un host TRUE no debe confundirse con la salida True
+    return re.compile(r"\b" + re.escape(texto) + r"\b")
+
+
+def normalizar_salida(salida, host, patrones=PATRONES_VOLATILES, sid=None):
+    """host y sid pueden ser texto o un patrón ya compilado."""
+    texto = salida.replace("\r\n", "\n")
+    if host:
+        patron_host = host if hasattr(host, "sub") else _patron_literal(host)
+        texto = patron_host.sub(MARCADOR_HOST, texto)
+    if sid:
+        # Solo el prefijo de máquina: los SID de dominio se mantienen distintos
+        patron_sid = sid if hasattr(sid, "sub") else re.compile(re.escape(sid) + r"(?=-\d)")
+        texto = patron_sid.sub(MARCADOR_SID, texto)
+    for patron, reemplazo in patrones:
+        texto = patron.sub(reemplazo, texto)
+    return texto
+
+
+class CacheLRU:
+    def __init__(self, max_entradas=256):
+        self.max_entradas = max_entradas
+        self.entradas = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+    
+    def obtener(self, clave):
+        if clave in self.entradas:
+            self.entradas.move_to_end(clave)
+            self.aciertos += 1
+            return self.entradas[clave]
+        self.fallos += 1
+        return None
+    
+    def guardar(self, clave, valor):
+        self.entradas[clave] = valor
+        self.entradas.move_to_end(clave)
+        while len(self.entradas) > self.max_entradas:
+            self.entradas.popitem(last=False)
+    
+    def tasa_aciertos(self):
+        total = self.aciertos + self.fallos
+        return round(self.aciertos / total, 4) if total else 0.0
+
+
+class EvaluadorFlota:
+    """
+    Evalúa muchos hosts a partir de sus salidas en bruto ({comando: salida}).
+    
+    Cada salida se normaliza y se resume con SHA-256; el resultado de cada
+    verificador se memoriza por la huella de sus fuentes, de modo que los
+    hosts de una misma imagen solo se evalúan una vez. El verificador evalúa
+    la salida normalizada, así que el resultado memorizado no contiene datos
+    de ningún host concreto hasta que se restauran los marcadores.
+    """
+    
+    def __init__(self, verificadores=None, max_entradas=256, patrones=PATRONES_VOLATILES, ahora=None):
+        self.verificadores = verificadores or VERIFICADORES
+        self.patrones = patrones
+        self.ahora = ahora
+        self.cache = CacheLRU(max_entradas)
+        self.estadisticas = {nombre: {"aciertos": 0, "fallos": 0} for nombre in self.verificadores}
+        self.reportes = {}
+    
+    def normalizar(self, host, salidas):
+        """Devuelve ({comando: salida normalizada}, [(marcador, valor del host)])."""
+        patron_host = _patron_literal(host) if host else None
+        sid = sid_maquina(salidas)
+        patron_sid = re.compile(re.escape(sid) + r"(?=-\d)") if sid else None
+        normalizadas = {
+            cmd: normalizar_salida(salida, patron_host, self.patrones, patron_sid)
+            for cmd, salida in salidas.items()
+        }
+        sustituciones = [(m, v) for m, v in ((MARCADOR_HOST, host), (MARCADOR_SID, sid)) if v]
+        return normalizadas, sustituciones
+    
+    def huellas(self, host, salidas):
+        return self._huellas(self.normalizar(host, salidas)[0])
+    
+    @staticmethod
+    def _huellas(normalizadas):
+        import hashlib
+        return {cmd: hashlib.sha256(t.encode("utf-8")).hexdigest() for cmd, t in normalizadas.items()}
+    
+    def evaluar_host(self, host, salidas):
+        normalizadas, sustituciones = self.normalizar(host, salidas)
+        huellas = self._huellas(normalizadas)
+        reportes = GeneradorReportes()
+        
+        for nombre, clase in self.verificadores.items():
+            clave = (nombre,) + tuple(huellas.get(cmd) for cmd in clase.comandos)
+            resultado = self.cache.obtener(clave)
+            if resultado is None:
+                self.estadisticas[nombre]["fallos"] += 1
+                fuentes = {cmd: normalizadas[cmd] for cmd in clase.comandos if cmd in normalizadas}
+                resultado = clase(salidas=fuentes, ahora=self.ahora).verificar()
+                self.cache.guardar(clave, resultado)
+            else:
+                self.estadisticas[nombre]["aciertos"] += 1
+            reportes.agregar_verificacion(nombre, self._restaurar(resultado, sustituciones))
         
-        with open("reporte_seguridad.html", "w", encoding="utf-8") as f:
-            f.write(html)
-        return "reporte_seguridad.html"
+        reportes.calcular_puntuaciones()
+        self.reportes[host] = reportes
+        return reportes
+    
+    @classmethod
+    def _restaurar(cls, valor, sustituciones):
+        # Copia el resultado compartido devolviendo a cada marcador el valor de este host
+        if isinstance(valor, str):
+            for marcador, real in sustituciones:
+                if marcador in valor:
+                    valor = valor.replace(marcador, real)
+            return valor
+        if isinstance(valor, dict):
+            return {k: cls._restaurar(v, sustituciones) for k, v in valor.items()}
+        if isinstance(valor, list):
+            return [cls._restaurar(v, sustituciones) for v in valor]
+        return valor
+    
+    def evaluar(self, hosts):
+        for host, salidas in hosts.items():
+            self.evaluar_host(host, salidas)
+        return self.resumen()
+    
+    def resumen(self):
+        por_fuente = {}
+        for nombre, e in self.estadisticas.items():
+            total = e["aciertos"] + e["fallos"]
+            por_fuente[nombre] = {
+                "aciertos": e["aciertos"],
+                "evaluaciones": e["fallos"],
+                "tasa_aciertos": round(e["aciertos"] / total, 4) if total else 0.0
+            }
+        
+        return {
+            "hosts": len(self.reportes),
+            "evaluaciones": self.cache.fallos,
+            "aciertos_cache": self.cache.aciertos,
+            "tasa_aciertos": self.cache.tasa_aciertos(),
+            "entradas_cache": len(self.cache.entradas),
+            "por_fuente": por_fuente,
+            "resultados": {
+                host: {
+                    "puntuacion_general": r.puntuacion_general,
+                    "controles_cumplidos": f"{r.controles_cumplidos}/{r.total_controles}",
+                    "total_hallazgos": len(r.hallazgos)
+                }
+                for host, r in self.reportes.items()
+            }
+        }
 
 
 # ============================================================================
 # EJECUTOR PRINCIPAL
 # ============================================================================
 
-def main():
+ALIAS_VERIFICADORES = {
+    "contrasenas": "Políticas de Contraseñas",
+    "actualizaciones": "Actualizaciones y Parches",
+    "firewall": "Firewall",
+    "antimalware": "Antimalware",
+    "auditoria": "Auditoría y Registros",
+    "usuarios": "Usuarios y Cuentas",
+    "encriptacion": "Encriptación"
+}
+
+FORMATOS_POR_DEFECTO = ("json", "html", "binario")
+
+
+def _resolver_verificador(alias):
+    clave = alias.strip().lower()
+    if clave in ALIAS_VERIFICADORES:
+        return ALIAS_VERIFICADORES[clave]
+    for nombre in VERIFICADORES:
+        if nombre.lower() == clave:
+            return nombre
+    raise ValueError(f"Verificador desconocido: '{alias}' (opciones: {', '.join(ALIAS_VERIFICADORES)})")
+
+
+def _parsear_selectores(valores):
+    """'usuarios,firewall' o 'usuarios:uac' -> {nombre: [texto de control, ...]}; '' = todo."""
+    selectores = {}
+    for valor in valores or []:
+        for selector in valor.split(","):
+            if not selector.strip():
+                continue
+            alias, _, control = selector.partition(":")
+            selectores.setdefault(_resolver_verificador(alias), []).append(control.strip().lower())
+    return selectores
+
+
+def nombres_controles(nombre):
+    """Nombres de los controles de un verificador, sin ejecutar ningún comando."""
+    return [c["nombre"] for c in VERIFICADORES[nombre](salidas={}).verificar().get("controles", [])]
+
+
+def seleccionar_verificadores(only=None, skip=None):
+    """
+    Devuelve {nombre: (controles incluidos, controles excluidos)} en el orden de
+    VERIFICADORES. Un texto de control que no coincide con ningún control del
+    verificador es un error (ValueError), antes de recolectar nada.
+    """
+    incluir = _parsear_selectores(only)
+    excluir = _parsear_selectores(skip)
+    seleccion = {}
+    for nombre in VERIFICADORES:
+        if incluir and nombre not in incluir:
+            continue
+        if "" in excluir.get(nombre, []):
+            continue
+        incluidos = [] if "" in incluir.get(nombre, [""]) else incluir[nombre]
+        excluidos = excluir.get(nombre, [])
+        if incluidos or excluidos:
+            controles = nombres_controles(nombre)
+            sin_coincidencia = [t for t in incluidos + excluidos if not any(t in c.lower() for c in controles)]
+            if sin_coincidencia:
+                raise ValueError(
+                    f"Ningún control de {nombre} coincide con {', '.join(repr(t) for t in sin_coincidencia)} "
+                    f"(controles: {', '.join(controles)})"
+                )
+        seleccion[nombre] = (incluidos, excluidos)
+    return seleccion
+
+
+def filtrar_controles(resultado, incluidos, excluidos):
+    """Deja solo los controles elegidos y sus hallazgos; el estado sale de lo que queda."""
+    if not incluidos and not excluidos:
+        return resultado
+    
+    def elegido(nombre):
+        nombre = nombre.lower()
+        return (not incluidos or any(t in nombre for t in incluidos)) and not any(t in nombre for t in excluidos)
+    
+    resultado["controles"] = [c for c in resultado.get("controles", []) if elegido(c["nombre"])]
+    resultado["hallazgos"] = [h for h in resultado.get("hallazgos", []) if elegido(h.get("control", ""))]
+    if resultado.get("estado") != "ERROR":
+        cumple = all(c["cumple"] for c in resultado["controles"]) and not resultado["hallazgos"]
+        resultado["estado"] = "CUMPLE" if cumple else "NO_CUMPLE"
+    return resultado
+
+
+def cargar_salidas(ruta, host=None):
+    """
+    Salidas en bruto a reproducir: contenedor .veri o JSON {comando: salida}.
+    Devuelve (salidas, fecha de la captura o None); la fecha sirve de 'ahora'
+    para que las antigüedades se midan como en el momento de la captura.
+    """
+    with open(ruta, "rb") as f:
+        es_binario = f.read(4) == MAGIA_BINARIO
+    if es_binario:
+        with LectorBinario(ruta) as lector:
+            hosts = lector.hosts()
+            if host is None:
+                if len(hosts) != 1:
+                    raise ValueError(f"{ruta} tiene {len(hosts)} hosts; indicar --host")
+                host = hosts[0]
+            elif host not in hosts:
+                raise ValueError(f"{ruta} no contiene el host '{host}'")
+            fecha = lector.leer(("host", host, "resumen")).get("fecha")
+            return lector.salidas(host), datetime.fromisoformat(fecha) if fecha else None
+    
+    with open(ruta, encoding="utf-8") as f:
+        datos = json.load(f)
+    if not isinstance(datos, dict):
+        return {}, None
+    if "salidas" in datos:
+        fecha = datos.get("fecha")
+        return datos["salidas"], datetime.fromisoformat(fecha) if fecha else None
+    return datos, None
+
+
+def crear_parser():
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="veri.py",
+        description="Verificador de seguridad Windows - ISO/IEC 27001/27002"
+    )
+    parser.add_argument("--only", action="append", metavar="SEL",
+                        help="verificadores o controles a ejecutar: 'usuarios,firewall' o 'usuarios:uac'")
+    parser.add_argument("--skip", action="append", metavar="SEL",
+                        help="verificadores o controles a omitir (misma sintaxis que --only)")
+    parser.add_argument("--formato", metavar="F[,F]",
+                        help=f"formatos de reporte: {', '.join(EMISORES)} o 'ninguno' "
+                             f"(por defecto {','.join(FORMATOS_POR_DEFECTO)})")
+    parser.add_argument("--salida", metavar="DIR",
+                        help="directorio donde escribir los reportes (por defecto el actual)")
+    parser.add_argument("--sin-ui", action="store_true",
+                        help="sin salida por consola ni apertura del reporte HTML")
+    parser.add_argument("--stdout", action="store_true",
+                        help="escribir el reporte JSON en stdout (implica --sin-ui)")
+    parser.add_argument("--entrada", metavar="RUTA",
+                        help="reproducir salidas capturadas (.veri o JSON) en lugar de ejecutar comandos")
+    parser.add_argument("--host", help="host a reproducir de un contenedor .veri con varios hosts")
+    return parser
+
+
+def _parsear_formatos(valor, por_defecto):
+    if valor is None:
+        return list(por_defecto)
+    formatos = [f.strip().lower() for f in valor.split(",") if f.strip()]
+    if formatos == ["ninguno"]:
+        return []
+    desconocidos = [f for f in formatos if f not in EMISORES]
+    if desconocidos:
+        raise ValueError(f"Formato desconocido: {', '.join(desconocidos)}")
+    return formatos
+
+
+def main(argv=None):
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    try:
+        seleccion = seleccionar_verificadores(args.only, args.skip)
+        formatos = _parsear_formatos(args.formato, () if args.stdout else FORMATOS_POR_DEFECTO)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    ui = not (args.sin_ui or args.stdout)
+    mostrar = print if ui else (lambda *a, **k: None)
+    
     try:
-        print("\n" + "="*80)
-        print("VERIFICADOR DE SEGURIDAD WINDOWS - ISO 27001/27002 v3.0 DETALLADO")
-        print("="*80 + "\n")
+        ahora = None
+        if args.entrada:
+            entrada, ahora = cargar_salidas(args.entrada, args.host)
+        elif not sys.platform.startswith('win'):
+            print("ERROR: Este programa solo funciona en Windows (usar --entrada para reproducir salidas)", file=sys.stderr)
+            return 1
+        else:
+            entrada = None
         
-        reportes = GeneradorReportes()
+        mostrar("\n" + "="*80)
+        mostrar("VERIFICADOR DE SEGURIDAD WINDOWS - ISO 27001/27002 v3.0 DETALLADO")
+        mostrar("="*80 + "\n")
         
-        verificadores = {
-            "Políticas de Contraseñas": VerificadorContraseñas(),
-            "Actualizaciones y Parches": VerificadorActualizaciones(),
-            "Firewall": VerificadorFirewall(),
-            "Antimalware": VerificadorAntimalware(),
-            "Auditoría y Registros": VerificadorAuditoria(),
-            "Usuarios y Cuentas": VerificadorUsuarios(),
-            "Encriptación": VerificadorEncriptacion()
-        }
+        if entrada is None:
+            # Todos los comandos de los verificadores elegidos se lanzan a la vez
+            mostrar("[*] Recolectando datos del sistema...")
+            entrada = recolectar(comandos_de(VERIFICADORES[n] for n in seleccion))
         
-        for nombre, verificador in verificadores.items():
-            print(f"[*] {nombre}...", end=" ")
+        reportes = GeneradorReportes(args.salida)
+        salidas = {}
+        
+        for nombre, (incluidos, excluidos) in seleccion.items():
+            mostrar(f"[*] {nombre}...", end=" ")
             try:
-                resultado = verificador.verificar()
+                verificador = VERIFICADORES[nombre](salidas=entrada, ahora=ahora)
+                resultado = filtrar_controles(verificador.verificar(), incluidos, excluidos)
                 reportes.agregar_verificacion(nombre, resultado)
+                salidas.update(verificador.salidas)
                 estado = "✓" if resultado.get("estado") == "CUMPLE" else "✗"
-                print(f"{estado} ({resultado.get('estado', 'DESCONOCIDO')})")
+                mostrar(f"{estado} ({resultado.get('estado', 'DESCONOCIDO')})")
             except Exception as e:
-                print(f"✗ ERROR")
+                mostrar(f"✗ ERROR")
         
         reportes.calcular_puntuaciones()
         
-        print("\n[*] Generando reportes...")
-        reportes.generar_json()
-        print("    ✓ reporte_seguridad.json")
-        html_path = reportes.generar_html()
-        print("    ✓ reporte_seguridad.html")
+        modelo = reportes.construir_modelo(salidas)
+        if formatos:
+            mostrar("\n[*] Generando reportes...")
+        rutas = emitir_reportes(modelo, formatos, args.salida)
+        for formato in formatos:
+            mostrar(f"    ✓ {rutas[formato]}")
+        html_path = rutas.get("html")
+        
+        if args.stdout:
+            sys.stdout.buffer.write(json.dumps(modelo.contenido(), ensure_ascii=False).encode("utf-8") + b"\n")
+            sys.stdout.flush()
         
-        print("\n" + "="*80)
-        print(f"Puntuación General: {reportes.puntuacion_general}%")
-        print(f"Controles Cumplidos: {reportes.controles_cumplidos}/{reportes.total_controles}")
-        print("\nPuntuaciones por Norma ISO:")
+        mostrar("\n" + "="*80)
+        mostrar(f"Puntuación General: {reportes.puntuacion_general}%")
+        mostrar(f"Controles Cumplidos: {reportes.controles_cumplidos}/{reportes.total_controles}")
+        mostrar("\nPuntuaciones por Norma ISO:")
         for iso, datos in sorted(reportes.puntuaciones_iso.items()):
-            print(f"  {iso}: {datos['porcentaje']}% ({datos['cumplidos']}/{datos['total']})")
-        print(f"\nTotal de Hallazgos: {len(reportes.hallazgos)}")
-        print("="*80 + "\n")
+            mostrar(f"  {iso}: {datos['porcentaje']}% ({datos['cumplidos']}/{datos['total']})")
+        mostrar(f"\nTotal de Hallazgos: {len(reportes.hallazgos)}")
+        mostrar("="*80 + "\n")
         
-        try:
-            os.startfile(html_path)
-        except:
-            pass
+        if ui and html_path:
+            try:
+                os.startfile(os.path.abspath(html_path))
+            except:
+                pass
         
         return 0
         
     except KeyboardInterrupt:
-        print("\n\n✗ Interrumpido por el usuario")
+        print("\n\n✗ Interrumpido por el usuario", file=sys.stderr)
         return 1
     except PermissionError:
-        print("\n✗ Error: Ejecuta como ADMINISTRADOR")
+        print("\n✗ Error: Ejecuta como ADMINISTRADOR", file=sys.stderr)
         return 1
     except Exception as e:
-        print(f"\n✗ Error: {str(e)}")
+        print(f"\n✗ Error: {str(e)}", file=sys.stderr)
         return 1
 
 